@@ -75,8 +75,13 @@ class Expr(ABC):
     namely `Interpreter` and `Resolver` use the visitor pattern. This
     pattern allows different classes to implement different behavior for
     the same types without changing the types themselves.
+
+    Nodes declare their attributes in `__slots__` to save a dictionary
+    per instance.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: Visitor[R]) -> R:
         raise NotImplementedError
@@ -93,6 +98,8 @@ class Assign(Expr):
         Expression to evaluate for new value of variable
     """
 
+    __slots__ = ("name", "value")
+
     def __init__(self, name: Token, value: Expr) -> None:
         self.name = name
         self.value = value
@@ -114,6 +121,8 @@ class Binary(Expr):
         Expression on right-hand side of operand
     """
 
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
@@ -136,6 +145,8 @@ class Call(Expr):
         List of arguments required to call `callee`
     """
 
+    __slots__ = ("callee", "paren", "arguments")
+
     def __init__(self, callee: Expr, paren: Token, arguments: list[Expr]) -> None:
         self.callee = callee
         self.paren = paren
@@ -156,6 +167,8 @@ class Get(Expr):
         Name of property
     """
 
+    __slots__ = ("item", "name")
+
     def __init__(self, item: Expr, name: Token) -> None:
         self.item = item
         self.name = name
@@ -175,6 +188,8 @@ class Grouping(Expr):
         Expression surrounded by parentheses to evaluate
     """
 
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr) -> None:
         self.expression = expression
 
@@ -190,6 +205,9 @@ class Literal(Expr):
     value : str | float
         Literal value
     """
+
+    __slots__ = ("value",)
+
     def __init__(self, value: str | float) -> None:
         self.value = value
 
@@ -210,6 +228,8 @@ class Logical(Expr):
         Expression to the right of the logical operator
     """
 
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
         self.left = left
         self.operator = operator
@@ -231,6 +251,9 @@ class Set(Expr):
     value : Expr
         Value to set for the property
     """
+
+    __slots__ = ("item", "name", "value")
+
     def __init__(self, item: Expr, name: Token, value: Expr) -> None:
         self.item = item
         self.name = name
@@ -251,6 +274,8 @@ class Super(Expr):
         Method or property following use of `super`
     """
 
+    __slots__ = ("keyword", "method")
+
     def __init__(self, keyword: Token, method: Token) -> None:
         self.keyword = keyword
         self.method = method
@@ -268,6 +293,8 @@ class This(Expr):
         Token for `this` keyword
     """
 
+    __slots__ = ("keyword",)
+
     def __init__(self, keyword: Token) -> None:
         self.keyword = keyword
 
@@ -286,6 +313,8 @@ class Unary(Expr):
         Expression on which to perform the operation
     """
 
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr) -> None:
         self.operator = operator
         self.right = right
@@ -303,6 +332,8 @@ class Variable(Expr):
         Token with name of variable
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: Token) -> None:
         self.name = name
 
@@ -324,6 +355,8 @@ class Comma(Expr):
         Expression to the right of the comma
     """
 
+    __slots__ = ("left", "right")
+
     def __init__(self, left: Expr, right: Expr) -> None:
         self.left = left
         self.right = right
@@ -345,6 +378,8 @@ class Conditional(Expr):
         Expression to evaluate if `condition` evaluates to false
     """
 
+    __slots__ = ("condition", "then_expression", "else_expression")
+
     def __init__(self, condition: Expr, then_expression: Expr, else_expression: Expr) -> None:
         self.condition = condition
         self.then_expression = then_expression
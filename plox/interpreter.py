@@ -1,6 +1,5 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from enum import IntFlag, unique
 import operator
 from time import time
 from typing import Any, Callable
@@ -11,35 +10,104 @@ from plox import tokens
 from plox import lox
 
 
-@unique
-class OperandType(IntFlag):
-    """Describe types for operations in Lox, combinations allowed."""
-    NUMBER = 1
-    STRING = 2
-
-
 class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
     """Traverse syntax trees, translate Lox to Python, and execute.
 
     Attributes
     ----------
-    global_env : Environment
+    global_env : GlobalEnvironment
         Environment of variables, classes, functions declared in global
         scope
     local_env : dict[expr.Expr, int]
         Environment of variables and functions declared in a local scope
+    global_cells : dict[expr.Expr, list[object]]
+        Map of expressions that refer to a global variable to the cell
+        that holds its value
+    loop_conditions : dict[stmt.While, tuple[int | None, expr.Variable, Callable, float]]
+        Loops whose condition compares a variable to a number, mapped to
+        the distance of the variable, the variable, the comparison, and
+        the number
     env : Environment
         Environment of current scope
+    expression_visitors : dict[type[expr.Expr], Callable[[expr.Expr], object]]
+        Map of types of expressions to bound methods that visit them
+    statement_visitors : dict[type[stmt.Stmt], Callable[[stmt.Stmt], None]]
+        Map of types of statements to bound methods that visit them
+    binary_operations : dict[tokens.TokenType, tuple[Callable, Callable]]
+        Map of types of operators of binary expressions to the bound
+        method that checks and evaluates the operands and the operation
+        to apply to them
 
     Methods
     -------
     interpret()
         Interpret and execute Lox source
     """
+    comparisons: dict[tokens.TokenType, Callable[[float, float], bool]] = {
+        tokens.TokenType.GREATER: operator.gt,
+        tokens.TokenType.GREATER_EQUAL: operator.ge,
+        tokens.TokenType.LESSER: operator.lt,
+        tokens.TokenType.LESSER_EQUAL: operator.le,
+    }
+
     def __init__(self) -> None:
-        self.global_env = Environment()
+        self.global_env = GlobalEnvironment()
         self.local_env: dict[expr.Expr, int] = {}
-        self.env = self.global_env
+        self.global_cells: dict[expr.Expr, list[object]] = {}
+        self.loop_conditions: dict[
+            stmt.While,
+            tuple[int | None, expr.Variable, Callable[[float, float], bool], float],
+        ] = {}
+        self.env: Environment = self.global_env
+
+        # Bind each visitor method once so evaluate() and execute() dispatch
+        # with a single lookup rather than through the accept() method of
+        # each node.
+        self.expression_visitors: dict[type[expr.Expr], Callable[[Any], object]] = {
+            expr.Assign: self.visit_assign_expr,
+            expr.Binary: self.visit_binary_expr,
+            expr.Call: self.visit_call_expr,
+            expr.Get: self.visit_get_expr,
+            expr.Grouping: self.visit_grouping_expr,
+            expr.Literal: self.visit_literal_expr,
+            expr.Logical: self.visit_logical_expr,
+            expr.Set: self.visit_set_expr,
+            expr.Super: self.visit_super_expr,
+            expr.This: self.visit_this_expr,
+            expr.Unary: self.visit_unary_expr,
+            expr.Variable: self.visit_variable_expr,
+            expr.Comma: self.visit_comma_expr,
+            expr.Conditional: self.visit_conditional_expr,
+        }
+        self.statement_visitors: dict[type[stmt.Stmt], Callable[[Any], None]] = {
+            stmt.Block: self.visit_block_stmt,
+            stmt.Class: self.visit_class_stmt,
+            stmt.Expression: self.visit_expression_stmt,
+            stmt.Function: self.visit_function_stmt,
+            stmt.If: self.visit_if_stmt,
+            stmt.Print: self.visit_print_stmt,
+            stmt.Return: self.visit_return_stmt,
+            stmt.Break: self.visit_break_stmt,
+            stmt.While: self.visit_while_stmt,
+            stmt.Var: self.visit_var_stmt,
+        }
+        # Likewise, look up the operation of a binary expression by the type
+        # of its operator once rather than compare the type with each case.
+        TokenType = tokens.TokenType
+        self.binary_operations: dict[
+            tokens.TokenType, tuple[Callable[..., Any], Callable[[Any, Any], Any]]
+        ] = {
+            TokenType.GREATER: (self.operate_on_operands, operator.gt),
+            TokenType.GREATER_EQUAL: (self.operate_on_operands, operator.ge),
+            TokenType.LESSER: (self.operate_on_operands, operator.lt),
+            TokenType.LESSER_EQUAL: (self.operate_on_operands, operator.le),
+            TokenType.BANG_EQUAL: (self.operate_on_operands, operator.ne),
+            TokenType.EQUAL_EQUAL: (self.operate_on_operands, operator.eq),
+            TokenType.MINUS: (self.operate_on_numbers, operator.sub),
+            TokenType.SLASH: (self.operate_on_numbers, operator.truediv),
+            TokenType.STAR: (self.operate_on_numbers, operator.mul),
+            TokenType.PLUS: (self.operate_on_operands, operator.add),
+        }
 
         # Provide a native function in Lox that outputs time in seconds since
         # Unix epoch.
@@ -76,26 +144,66 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
 
     def evaluate(self, expression: expr.Expr) -> Any:
         """Produce the value of an expression."""
-        return expression.accept(self)
+        return self.expression_visitors[type(expression)](expression)
 
     def execute(self, statement: stmt.Stmt) -> None:
         """Perform side effects of a statement."""
-        statement.accept(self)
+        self.statement_visitors[type(statement)](statement)
 
     def resolve(self, expression: expr.Expr, depth: int) -> None:
         """Store number of scopes from variable use to find value."""
         self.local_env[expression] = depth
 
+    def resolve_global(self, expression: expr.Expr, name: tokens.Token) -> None:
+        """Store cell of global variable to find value without lookup."""
+        self.global_cells[expression] = self.global_env.cell(name.lexeme)
+
+    def forget(self, nodes: list[expr.Expr | stmt.While]) -> None:
+        """Drop what was stored for nodes of syntax trees no longer run."""
+        for node in nodes:
+            if isinstance(node, stmt.While):
+                self.loop_conditions.pop(node, None)
+            else:
+                self.local_env.pop(node, None)
+                self.global_cells.pop(node, None)
+
+    def resolve_loop(self, statement: stmt.While) -> None:
+        """Store a loop whose condition compares a variable to a number.
+
+        Such a condition is checked directly in visit_while_stmt()
+        without evaluation of its syntax tree for each iteration. This
+        must be called after the variable in the condition is resolved.
+        """
+        condition = statement.condition
+        if (
+            isinstance(condition, expr.Binary) and
+            isinstance(condition.left, expr.Variable) and
+            isinstance(condition.right, expr.Literal) and
+            isinstance(condition.right.value, float) and
+            (compare := self.comparisons.get(condition.operator.token_type)) is not None
+        ):
+            self.loop_conditions[statement] = (
+                self.local_env.get(condition.left),
+                condition.left,
+                compare,
+                condition.right.value,
+            )
+
     def execute_block(
         self, statements: list[stmt.Stmt], env: Environment
     ) -> None:
-        """Enter new scope and execute statements in this space."""
+        """Enter new scope and execute statements in this space.
+
+        Every function call and block runs through this loop, so bind the
+        table of visitors to a local and dispatch on each statement
+        directly rather than through execute().
+        """
         previous = self.env
+        visitors = self.statement_visitors
         try:
             self.env = env
             for statement in statements:
-                if statement:
-                    self.execute(statement)
+                visitors[type(statement)](statement)
         finally:
             self.env = previous
 
@@ -154,12 +262,50 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
         raise Break()
 
     def visit_while_stmt(self, statement: stmt.While) -> None:
+        if (loop_condition := self.loop_conditions.get(statement)) is not None:
+            self.execute_compare_loop(statement, *loop_condition)
+            return
+
         while self.is_truthy(self.evaluate(statement.condition)):
             try:
                 self.execute(statement.body)
             except Break:
                 return
 
+    def execute_compare_loop(
+        self,
+        statement: stmt.While,
+        distance: int | None,
+        variable: expr.Variable,
+        compare: Callable[[float, float], bool],
+        number: float,
+    ) -> None:
+        """Execute a loop whose condition compares a variable to a number.
+
+        The environment of the variable does not change while the loop
+        runs, so look it up once and compare its value directly for each
+        iteration. Any value other than a number falls back to the
+        evaluation of the condition to report the error as usual.
+        """
+        values: Any
+        key: object
+        if distance is None:
+            values, key = self.global_cells[variable], 0
+        else:
+            values, key = self.env.ancestor(distance).values, variable.name.lexeme
+
+        while True:
+            if type(value := values[key]) is float:
+                if not compare(value, number):
+                    return
+            elif not self.is_truthy(self.evaluate(statement.condition)):
+                return
+
+            try:
+                self.execute(statement.body)
+            except Break:
+                return
+
     def visit_var_stmt(self, statement: stmt.Var) -> None:
         for name, initializer in statement.variables.items():
             value = None
@@ -173,37 +319,23 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
         if (distance := self.local_env.get(expression)) is not None:
             self.env.assign_at(distance, expression.name, value)
         else:
-            self.global_env.assign(expression.name, value)
+            cell = self.global_cells[expression]
+            if cell[0] is UNDEFINED:
+                raise LoxRuntimeError(
+                    expression.name, f"undefined variable '{expression.name.lexeme}'"
+                )
+            cell[0] = value
 
         return value
 
     def visit_binary_expr(self, expression: expr.Binary) -> object:
-        match expression.operator.token_type:
-            case tokens.TokenType.GREATER:
-                return self.perform_operation(operator.gt, expression)
-            case tokens.TokenType.GREATER_EQUAL:
-                return self.perform_operation(operator.ge, expression)
-            case tokens.TokenType.LESSER:
-                return self.perform_operation(operator.lt, expression)
-            case tokens.TokenType.LESSER_EQUAL:
-                return self.perform_operation(operator.lt, expression)
-            case tokens.TokenType.BANG_EQUAL:
-                return self.perform_operation(operator.ne, expression)
-            case tokens.TokenType.EQUAL_EQUAL:
-                return self.perform_operation(operator.eq, expression)
-            case tokens.TokenType.MINUS:
-                return self.perform_operation(operator.sub, expression, OperandType.NUMBER)
-            case tokens.TokenType.SLASH:
-                try:
-                    return self.perform_operation(operator.truediv, expression, OperandType.NUMBER)
-                except ZeroDivisionError:
-                    raise LoxRuntimeError(expression.operator, "cannot divide by zero")
-            case tokens.TokenType.STAR:
-                return self.perform_operation(operator.mul, expression, OperandType.NUMBER)
-            case tokens.TokenType.PLUS:
-                return self.perform_operation(operator.add, expression)
-        assert False, "This statement should not be reached."
-        return None
+        operate, operation = self.binary_operations[expression.operator.token_type]
+        try:
+            return operate(operation, expression)
+        except ZeroDivisionError:
+            # Only division raises this. A division nested in an operand
+            # reports its own error before it reaches this handler.
+            raise LoxRuntimeError(expression.operator, "cannot divide by zero")
 
     def visit_call_expr(self, expression: expr.Call) -> object:
         callee = self.evaluate(expression.callee)
@@ -233,7 +365,7 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
 
     def visit_logical_expr(self, expression: expr.Logical) -> object:
         left = self.evaluate(expression.left)
-        if expression.operator.token_type == tokens.TokenType.OR:
+        if expression.operator.token_type is tokens.TokenType.OR:
             if self.is_truthy(left):
                 return left
         else:
@@ -268,8 +400,8 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
     def visit_this_expr(self, expression: expr.This) -> object:
         return self.look_up_variable(expression.keyword, expression)
 
-    def visit_grouping_expr(self, expression: expr.Grouping) -> expr.Expr:
-        return expression.expression
+    def visit_grouping_expr(self, expression: expr.Grouping) -> object:
+        return self.evaluate(expression.expression)
 
     def visit_unary_expr(self, expression: expr.Unary) -> float:
         right = self.evaluate(expression.right)
@@ -307,7 +439,9 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
         """
         if (distance := self.local_env.get(expression)) is not None:
             return self.env.get_at(distance, name.lexeme)
-        return self.global_env.get(name)
+        if (value := self.global_cells[expression][0]) is UNDEFINED:
+            raise LoxRuntimeError(name, f"undefined variable '{name.lexeme}'")
+        return value
 
     def is_truthy(self, item: object) -> bool:
         """Determine the truth of an expression in Lox."""
@@ -338,47 +472,65 @@ class Interpreter(expr.Visitor[object], stmt.Visitor[None]):
 
         return str(item)
 
-    def perform_operation(
+    def operate_on_numbers(
         self,
-        operator: Callable[[str | float, str | float], str | float],
+        operator: Callable[[float, float], float],
         expression: expr.Binary,
-        operand_type: OperandType = OperandType.NUMBER | OperandType.STRING,
-    ) -> str | float:
-        """Perform an operation given a binary expression.
+    ) -> float:
+        """Perform an operation that only accepts numbers as operands.
 
         This function serves as a helper function for
         visit_binary_expr() above.
 
         Parameters
         ----------
-        operator : Callable[[str | float, str | float], str | float]
+        operator : Callable[[float, float], float]
             A function that requires two arguments and returns a single
             value
         expression : expr.Binary
             Binary expression that contains two expressions, left and
             right
-        operand_type : OperandType
-            The acceptable type for provided operands based on the
-            operation to be performed
         """
-        assert operand_type != 0, "`operator` must some type of variable"
+        l = self.evaluate(expression.left)
+        r = self.evaluate(expression.right)
+
+        if isinstance(l, float) and isinstance(r, float):
+            return operator(l, r)
+        raise LoxRuntimeError(expression.operator, "operands must both be numbers")
+
+    def operate_on_operands(
+        self,
+        operator: Callable[[Any, Any], Any],
+        expression: expr.Binary,
+    ) -> object:
+        """Perform an operation that accepts two numbers or two strings.
+
+        This function serves as a helper function for
+        visit_binary_expr() above.
 
+        Parameters
+        ----------
+        operator : Callable[[Any, Any], Any]
+            A function that requires two arguments and returns a single
+            value
+        expression : expr.Binary
+            Binary expression that contains two expressions, left and
+            right
+        """
         l = self.evaluate(expression.left)
         r = self.evaluate(expression.right)
 
-        if OperandType.NUMBER in operand_type and isinstance(l, float) and isinstance(r, float):
-            return operator(float(l), float(r))
-        elif OperandType.STRING in operand_type and isinstance(l, str) and isinstance(r, str):
-            return operator(str(l), str(r))
+        if isinstance(l, float) and isinstance(r, float):
+            return operator(l, r)
+        elif isinstance(l, str) and isinstance(r, str):
+            return operator(l, r)
+        raise LoxRuntimeError(
+            expression.operator, "operands must be either both numbers or both strings"
+        )
+
 
-        # This logic only works if there are no more than two types in OperandType.
-        if OperandType.NUMBER in operand_type and OperandType.STRING in operand_type:
-            errmsg = "operands must be either both numbers or both strings"
-        elif OperandType.STRING not in operand_type:
-            errmsg = "operands must both be numbers"
-        elif OperandType.NUMBER not in operand_type:
-            errmsg = "operands must both be strings"
-        raise LoxRuntimeError(expression.operator, errmsg)
+# Placeholder of a global variable that is referenced but not yet defined.
+UNDEFINED = object()
 
 
 class LoxRuntimeError(RuntimeError):
@@ -428,6 +580,9 @@ class LoxFunction(LoxCallable):
     is_initializer : bool
         Indicate whether the function is a constructor or initializer
         for a class
+    parameters : tuple[str, ...], optional
+        Names of the parameters of the declaration, passed by `bind()`
+        to avoid collecting them again for each bound method
 
     Methods
     -------
@@ -444,14 +599,18 @@ class LoxFunction(LoxCallable):
         declaration: stmt.Function,
         closure: Environment,
         is_initializer: bool,
+        parameters: tuple[str, ...] | None = None,
     ) -> None:
         self.declaration = declaration
         self.closure = closure
         self.is_initializer = is_initializer
+        if parameters is None:
+            parameters = tuple(parameter.lexeme for parameter in declaration.params)
+        self.parameters = parameters
 
     def arity(self) -> int:
         """Return number of paramters passed to function."""
-        return len(self.declaration.params)
+        return len(self.parameters)
 
     def call(self, interpreter: Interpreter, arguments: list[object]) -> object:
         """Call the function, executing its statements.
@@ -470,10 +629,12 @@ class LoxFunction(LoxCallable):
             function in the source and pop it from the stack
         """
         # Define arguments in environment of function to execute statements in
-        # the block without error.
+        # the block without error. The arity of the call was checked by the
+        # caller, so build the bindings in a single pass rather than one
+        # define() per parameter.
         env = Environment(self.closure)
-        for parameter, argument in zip(self.declaration.params, arguments):
-            env.define(parameter.lexeme, argument)
+        if self.parameters:
+            env.values = dict(zip(self.parameters, arguments))
 
         try:
             interpreter.execute_block(self.declaration.body, env)
@@ -504,7 +665,9 @@ class LoxFunction(LoxCallable):
         """
         env = Environment(self.closure)
         env.define("this", instance)
-        return LoxFunction(self.declaration, env, self.is_initializer)
+        return LoxFunction(
+            self.declaration, env, self.is_initializer, self.parameters
+        )
 
     def __str__(self) -> str:
         return f"<fn {self.declaration.name.lexeme}>"
@@ -522,6 +685,13 @@ class LoxClass(LoxCallable):
     methods : dict[str, LoxFunction]
         Methods of class
 
+    Attributes
+    ----------
+    methods : dict[str, LoxFunction]
+        Methods of class and those it inherits from its ancestors
+    initializer : LoxFunction
+        Method `init` of class or of one of its ancestors if it exists
+
     Methods
     -------
     arity() : int
@@ -538,13 +708,20 @@ class LoxClass(LoxCallable):
     ) -> None:
         self.name = name
         self.superclass = superclass
-        self.methods = methods
+        # Flatten inherited methods into a single table once, since a class
+        # never changes after its declaration.
+        self.methods: dict[str, LoxFunction]
+        if superclass is not None:
+            self.methods = {**superclass.methods, **methods}
+        else:
+            self.methods = methods
+        self.initializer: LoxFunction | None = self.methods.get("init")
 
     def arity(self) -> int:
         """Return number of parameters required to construct class."""
-        if (initializer := self.find_method("init")) is None:
+        if self.initializer is None:
             return 0
-        return initializer.arity()
+        return self.initializer.arity()
 
     def call(self, interpreter: Interpreter, arguments: list[object]) -> object:
         """Create an instance of the class.
@@ -557,27 +734,22 @@ class LoxClass(LoxCallable):
             Arguments required by the class initializer or constructor
         """
         instance = LoxInstance(self)
-        if (initializer := self.find_method("init")) is not None:
-            initializer.bind(instance).call(interpreter, arguments)
+        if self.initializer is not None:
+            self.initializer.bind(instance).call(interpreter, arguments)
         return instance
 
     def find_method(self, name: str) -> LoxFunction:
         """Return method of class or one of its ancestors if it exists.
 
-        Recursively search the inheritance lineage if the method is not
-        overloaded in the current class and return the first method with
-        a matching name.
+        Inherited methods are flattened into the table of the class upon
+        its creation, so the method is found with a single lookup.
 
         Parameters
         ----------
         name : str
             Name of method
         """
-        if (method := self.methods.get(name)) is not None:
-            return method
-        elif self.superclass is not None:
-            return self.superclass.find_method(name)
-        return None
+        return self.methods.get(name)
 
     def __str__(self) -> str:
         return self.name
@@ -666,11 +838,17 @@ class Environment:
     ----------
     enclosing : Environment
         Environment that wraps new environment created
+    ancestors : tuple[Environment, ...]
+        Enclosing environments from outermost to innermost, such that
+        the last item is `enclosing`
     values : dict[str, object]
         Map of variables to values
     """
     def __init__(self, enclosing: Environment = None) -> None:
         self.enclosing = enclosing
+        self.ancestors: tuple[Environment, ...] = (
+            enclosing.ancestors + (enclosing,) if enclosing is not None else ()
+        )
         self.values: dict[str, object] = {}
 
     def define(self, name: str, value: object) -> None:
@@ -678,11 +856,15 @@ class Environment:
         self.values[name] = value
 
     def ancestor(self, distance: int) -> Environment:
-        """Return enclosing environment some distance from current."""
-        env = self
-        for i in range(distance):
-            env = env.enclosing
-        return env
+        """Return enclosing environment some distance from current.
+
+        Index the chain of enclosing environments built upon creation of
+        this environment rather than walk it, so variables resolve in
+        constant time regardless of the depth of nesting.
+        """
+        if distance:
+            return self.ancestors[-distance]
+        return self
 
     def get_at(self, distance: int, name: str) -> object:
         """Return value from some enclosing environment.
@@ -755,3 +937,75 @@ class Environment:
             self.enclosing.assign(name, value)
         else:
             raise LoxRuntimeError(name, f"undefined variable '{name.lexeme}'")
+
+
+class GlobalEnvironment(Environment):
+    """Table of bindings for variables declared in global scope.
+
+    Store each value in a cell, a list with a single item, that exists
+    for as long as the environment. `Resolver` hands the cell of each
+    global variable to the interpreter ahead of time, so reads and
+    writes of global variables skip a lookup by name.
+
+    Attributes
+    ----------
+    ancestors : tuple[()]
+        Empty chain of enclosing environments, which environments of
+        local scopes extend
+    cells : dict[str, list[object]]
+        Map of variables to cells that contain values, where the value
+        `UNDEFINED` marks a variable referenced prior to its definition
+    """
+    def __init__(self) -> None:
+        # Skip the initializer of `Environment`. Nothing encloses the global
+        # scope, and its values live in cells rather than a table of values,
+        # so an access to either fails rather than find nothing.
+        self.ancestors = ()
+        self.cells: dict[str, list[object]] = {}
+
+    def cell(self, name: str) -> list[object]:
+        """Return cell of a variable, creating it if necessary."""
+        if (cell := self.cells.get(name)) is None:
+            cell = self.cells[name] = [UNDEFINED]
+        return cell
+
+    def define(self, name: str, value: object) -> None:
+        """Define a (new) value in the environment."""
+        self.cell(name)[0] = value
+
+    def get(self, name: tokens.Token) -> object:
+        """Retrieve a value from the environment.
+
+        Parameters
+        ----------
+        name : tokens.Token
+            Token with lexeme to use as key
+
+        Raises
+        ------
+        LoxRuntimeError
+            Raise a runtime exception when undefined variable are used
+        """
+        if (cell := self.cells.get(name.lexeme)) is None or cell[0] is UNDEFINED:
+            raise LoxRuntimeError(name, f"undefined variable '{name.lexeme}'")
+        return cell[0]
+
+    def assign(self, name: tokens.Token, value: object) -> None:
+        """Update a value in the environment.
+
+        Parameters
+        ----------
+        name : tokens.Token
+            Token with lexeme to use as key
+        value : object
+            New value
+
+        Raises
+        ------
+        LoxRuntimeError
+            Raise a runtime exception on attempt to update a key-value
+            pair that does not exist
+        """
+        if (cell := self.cells.get(name.lexeme)) is None or cell[0] is UNDEFINED:
+            raise LoxRuntimeError(name, f"undefined variable '{name.lexeme}'")
+        cell[0] = value
@@ -1,21 +1,120 @@
 from __future__ import annotations
-import readline
+import hashlib
 import sys
-
+from collections import OrderedDict
+from contextvars import ContextVar
+
+try:
+    # Importing readline enables line editing and history in the REPL. It is
+    # optional, and some interpreters and platforms do not provide it.
+    import readline
+except ImportError:
+    pass
+
+from plox import expr
+from plox import stmt
 from plox.interpreter import Interpreter, LoxRuntimeError
+from plox.optimizer import ConstFolder, Normalizer
 from plox.parser import Parser
 from plox.resolver import Resolver
 from plox.scanner import Scanner
 from plox.tokens import Token, TokenType
 
 
-had_error = False
-had_runtime_error = False
-interpreter = Interpreter()
+# Resolved syntax trees of a source, and the nodes whose resolution the
+# interpreter stores.
+Program = tuple[list[stmt.Stmt], list[expr.Expr | stmt.While]]
+
+
+class LoxSession:
+    """State of one program or REPL run by the Lox interpreter.
+
+    Each session owns its interpreter and error flags, so that separate
+    threads or contexts may run Lox source at the same time without
+    interfering with one another.
+
+    Attributes
+    ----------
+    had_error : bool
+        Flag set when the source contains a syntax or resolution error
+    had_runtime_error : bool
+        Flag set when the interpreter encounters a runtime error
+    interpreter : Interpreter
+        Interpreter that retains global state between runs of the session
+    programs : OrderedDict[bytes, Program]
+        Syntax trees of recently run sources and the nodes resolved in
+        them, keyed by digest of source and ordered from least to most
+        recently run
+
+    Methods
+    -------
+    find_program() : list[stmt.Stmt] | None
+        Return syntax trees of source run before if still remembered
+    remember_program() : None
+        Remember syntax trees of source, forgetting least recently run
+
+    Notes
+    -----
+    The interpreter stores the resolution of each variable and loop by
+    node. When a program is forgotten, so is what the interpreter stored
+    for its nodes, so a long REPL session holds resolutions for at most
+    `max_programs` programs.
+    """
+
+    # Number of programs to remember in each session.
+    max_programs = 128
+
+    def __init__(self) -> None:
+        self.had_error: bool = False
+        self.had_runtime_error: bool = False
+        self.interpreter: Interpreter = Interpreter()
+        self.programs: OrderedDict[bytes, Program] = OrderedDict()
+
+    def find_program(self, digest: bytes) -> list[stmt.Stmt] | None:
+        """Return syntax trees of source run before if still remembered."""
+        program = self.programs.get(digest)
+        if program is None:
+            return None
+        self.programs.move_to_end(digest)
+        return program[0]
+
+    def remember_program(self, digest: bytes, program: Program) -> None:
+        """Remember syntax trees of source, forgetting least recently run."""
+        self.programs[digest] = program
+        if len(self.programs) > self.max_programs:
+            _, (_, resolved) = self.programs.popitem(last=False)
+            self.interpreter.forget(resolved)
+
+
+current_session: ContextVar[LoxSession] = ContextVar("current_session")
+
+
+def get_session() -> LoxSession:
+    """Return the session of the current context, starting one if needed."""
+    try:
+        return current_session.get()
+    except LookupError:
+        session = LoxSession()
+        current_session.set(session)
+        return session
+
+
+def __getattr__(name: str) -> object:
+    """Return the interpreter of the current session as `lox.interpreter`.
+
+    Nothing builds an interpreter at import. One is built with the first
+    session, which begins only once source is run or the attribute is read.
+    """
+    if name == "interpreter":
+        return get_session().interpreter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def run_file(filepath: str) -> None:
     """Input source from a file to Lox interpreter."""
+    session = LoxSession()
+    current_session.set(session)
+
     try:
         with open(filepath, "r") as f:
             source = f.read()
@@ -24,28 +123,37 @@ def run_file(filepath: str) -> None:
         print(f"unable to read file '{filepath}'", file=sys.stderr)
         sys.exit(65)
 
-    if had_error:
+    if session.had_error:
         sys.exit(64)
-    elif had_runtime_error:
+    elif session.had_runtime_error:
         sys.exit(70)
 
 
 def run_prompt() -> None:
     """Start a REPL and input lines of source to Lox interpreter."""
-    global had_error
+    session = LoxSession()
+    current_session.set(session)
+
+    if not sys.stdin.isatty():
+        # Source piped from a file or another program needs no prompt nor
+        # line editing, so read and run it whole rather than line by line.
+        # A trailing backslash still continues a line, as it does below.
+        lines = []
+        for line in sys.stdin.read().splitlines():
+            line = line.rstrip()
+            lines.append(line[:-1] if line.endswith("\\") else line + "\n")
+        run("".join(lines), repl=True)
+        return
 
     while True:
         try:
-            multiline = ""
+            source = ""
             while True:
-                line = input("... " if multiline else ">>> ")
-                if (line := line.rstrip()).endswith("\\"):
-                    multiline += line.removesuffix("\\")
-                elif multiline:
-                    multiline += line
-                    break
-                else:
+                line = input("... " if source else ">>> ").rstrip()
+                if not line.endswith("\\"):
+                    source += line
                     break
+                source += line[:-1]
         except KeyboardInterrupt:
             print()
             continue
@@ -53,10 +161,8 @@ def run_prompt() -> None:
             print()
             return
 
-        if multiline:
-            line = multiline
-        run(line, repl=True)
-        had_error = False
+        run(source, repl=True)
+        session.had_error = False
 
 
 def run(source: str, repl: bool = False) -> None:
@@ -64,23 +170,57 @@ def run(source: str, repl: bool = False) -> None:
 
     1. Tokenize input.
     2. Parse tokens into syntax trees.
-    3. Resolve declarations and definitions of local variables in
+    3. Fold constant subexpressions and lower comma expressions in
+       statement position.
+    4. Resolve declarations and definitions of local variables in
        separate pass.
-    4. Traverse syntax trees, translate Lox to Python, and execute.
+    5. Traverse syntax trees, translate Lox to Python, and execute.
+
+    The resolved syntax trees of source without errors are remembered,
+    so running the same source again in the session starts from step 5.
+    Errors are recorded in the session of the current context.
     """
+    session = get_session()
+    digest = hashlib.blake2b(source.encode(), digest_size=16).digest()
+    statements = session.find_program(digest)
+    if statements is None:
+        program = parse_and_resolve(source)
+        if program is None:
+            return
+        session.remember_program(digest, program)
+        statements = program[0]
+
+    session.interpreter.interpret(statements, repl)
+
+
+def parse_and_resolve(source: str) -> Program | None:
+    """Translate Lox source code into resolved syntax trees.
+
+    Return the syntax trees with the nodes resolved in them, or None if
+    the source contains an error.
+    """
+    session = get_session()
+    # The scanner, the parser, and the list of tokens are freed once this
+    # returns, before the interpreter runs. Only the tokens the syntax
+    # trees refer to survive.
     scanner = Scanner(source)
     tokens = scanner.scan_tokens()
-    parser = Parser(tokens)
-    statements = parser.parse()
-    if had_error:
-        return
+    statements = Parser(tokens, scanner.types).parse()
+    if session.had_error:
+        return None
+
+    ConstFolder().fold(statements)
+    Normalizer().normalize(statements)
 
-    resolver = Resolver(interpreter)
+    resolver = Resolver(session.interpreter)
     resolver.resolve(statements)
-    if had_error:
-        return
+    if session.had_error:
+        # The syntax trees never run, so neither does what the interpreter
+        # stored for them.
+        session.interpreter.forget(resolver.resolved)
+        return None
 
-    interpreter.interpret(statements, repl)
+    return statements, resolver.resolved
 
 
 def error(item: int | Token, message: str) -> None:
@@ -90,23 +230,19 @@ def error(item: int | Token, message: str) -> None:
         report(line, "", message)
     elif isinstance(item, Token):
         token = item
-        if token.token_type == TokenType.EOF:
+        if token.token_type is TokenType.EOF:
             report(token.line, "at end", message)
         else:
             report(token.line, f"at '{token.lexeme}'", message)
 
 
 def runtime_error(error: LoxRuntimeError) -> None:
-    """Output error message and set global runtime error variable."""
-    global had_runtime_error
-
+    """Output error message and flag runtime error in current session."""
     print(error)
-    had_runtime_error = True
+    get_session().had_runtime_error = True
 
 
 def report(line: int, where: str, message: str) -> None:
-    """Output error message and set global error variable."""
-    global had_error
-
+    """Output error message and flag error in current session."""
     print(f"[line {line}] error {where}: {message}", file=sys.stderr)
-    had_error = True
+    get_session().had_error = True
@@ -0,0 +1,255 @@
+from __future__ import annotations
+import operator
+from typing import Callable
+
+from plox import expr
+from plox import stmt
+from plox.tokens import TokenType
+
+
+class ConstFolder(expr.Visitor[expr.Expr], stmt.Visitor[None]):
+    """Fold constant subexpressions of syntax trees in place.
+
+    Evaluate expressions whose operands are all literals once, before
+    resolution and interpretation, and replace them with a single
+    `expr.Literal`. Each folded node is one less node the interpreter
+    must dispatch on every evaluation.
+
+    Only operations that cannot fail are folded. Operations that raise
+    a runtime error, like division by zero or negation of a string, are
+    left untouched so the interpreter reports them as usual.
+
+    Methods
+    -------
+    fold() : None
+        Fold constant subexpressions in given statements
+    """
+
+    arithmetic: dict[TokenType, Callable[[float, float], float]] = {
+        TokenType.MINUS: operator.sub,
+        TokenType.PLUS: operator.add,
+        TokenType.SLASH: operator.truediv,
+        TokenType.STAR: operator.mul,
+    }
+
+    def fold(self, statements: list[stmt.Stmt]) -> None:
+        """Fold constant subexpressions in given statements."""
+        for statement in statements:
+            statement.accept(self)
+
+    def fold_expr(self, expression: expr.Expr) -> expr.Expr:
+        """Return folded replacement for an expression."""
+        return expression.accept(self)
+
+    def visit_block_stmt(self, statement: stmt.Block) -> None:
+        self.fold(statement.statements)
+
+    def visit_class_stmt(self, statement: stmt.Class) -> None:
+        for method in statement.methods:
+            self.fold(method.body)
+
+    def visit_expression_stmt(self, statement: stmt.Expression) -> None:
+        statement.expression = self.fold_expr(statement.expression)
+
+    def visit_function_stmt(self, statement: stmt.Function) -> None:
+        self.fold(statement.body)
+
+    def visit_if_stmt(self, statement: stmt.If) -> None:
+        statement.condition = self.fold_expr(statement.condition)
+        statement.then_branch.accept(self)
+        if statement.else_branch is not None:
+            statement.else_branch.accept(self)
+
+    def visit_print_stmt(self, statement: stmt.Print) -> None:
+        statement.expression = self.fold_expr(statement.expression)
+
+    def visit_return_stmt(self, statement: stmt.Return) -> None:
+        if statement.value is not None:
+            statement.value = self.fold_expr(statement.value)
+
+    def visit_break_stmt(self, statement: stmt.Break) -> None:
+        return
+
+    def visit_while_stmt(self, statement: stmt.While) -> None:
+        statement.condition = self.fold_expr(statement.condition)
+        statement.body.accept(self)
+
+    def visit_var_stmt(self, statement: stmt.Var) -> None:
+        for name, initializer in statement.variables.items():
+            if initializer is not None:
+                statement.variables[name] = self.fold_expr(initializer)
+
+    def visit_assign_expr(self, expression: expr.Assign) -> expr.Expr:
+        expression.value = self.fold_expr(expression.value)
+        return expression
+
+    def visit_binary_expr(self, expression: expr.Binary) -> expr.Expr:
+        expression.left = left = self.fold_expr(expression.left)
+        expression.right = right = self.fold_expr(expression.right)
+
+        if (
+            (operation := self.arithmetic.get(expression.operator.token_type)) is None or
+            not isinstance(left, expr.Literal) or
+            not isinstance(right, expr.Literal) or
+            not isinstance(left.value, float) or
+            not isinstance(right.value, float)
+        ):
+            return expression
+
+        if operation is operator.truediv and right.value == 0:
+            return expression
+        return expr.Literal(operation(left.value, right.value))
+
+    def visit_call_expr(self, expression: expr.Call) -> expr.Expr:
+        expression.callee = self.fold_expr(expression.callee)
+        expression.arguments = [self.fold_expr(argument) for argument in expression.arguments]
+        return expression
+
+    def visit_get_expr(self, expression: expr.Get) -> expr.Expr:
+        expression.item = self.fold_expr(expression.item)
+        return expression
+
+    def visit_grouping_expr(self, expression: expr.Grouping) -> expr.Expr:
+        # Parentheses only influence the shape of the tree, so they need not
+        # survive as a node of their own once the tree is built.
+        return self.fold_expr(expression.expression)
+
+    def visit_literal_expr(self, expression: expr.Literal) -> expr.Expr:
+        return expression
+
+    def visit_logical_expr(self, expression: expr.Logical) -> expr.Expr:
+        expression.left = self.fold_expr(expression.left)
+        expression.right = self.fold_expr(expression.right)
+        return expression
+
+    def visit_set_expr(self, expression: expr.Set) -> expr.Expr:
+        expression.item = self.fold_expr(expression.item)
+        expression.value = self.fold_expr(expression.value)
+        return expression
+
+    def visit_super_expr(self, expression: expr.Super) -> expr.Expr:
+        return expression
+
+    def visit_this_expr(self, expression: expr.This) -> expr.Expr:
+        return expression
+
+    def visit_unary_expr(self, expression: expr.Unary) -> expr.Expr:
+        expression.right = right = self.fold_expr(expression.right)
+        if (
+            expression.operator.token_type is TokenType.MINUS and
+            isinstance(right, expr.Literal) and
+            isinstance(right.value, float)
+        ):
+            return expr.Literal(-right.value)
+        return expression
+
+    def visit_variable_expr(self, expression: expr.Variable) -> expr.Expr:
+        return expression
+
+    def visit_comma_expr(self, expression: expr.Comma) -> expr.Expr:
+        expression.left = self.fold_expr(expression.left)
+        expression.right = self.fold_expr(expression.right)
+        return expression
+
+    def visit_conditional_expr(self, expression: expr.Conditional) -> expr.Expr:
+        expression.condition = condition = self.fold_expr(expression.condition)
+        expression.then_expression = then_expression = self.fold_expr(
+            expression.then_expression
+        )
+        expression.else_expression = else_expression = self.fold_expr(
+            expression.else_expression
+        )
+
+        # Only discard a branch that is itself a literal. A discarded branch
+        # is never resolved, and the variables it uses would otherwise be
+        # reported as unused.
+        if isinstance(condition, expr.Literal):
+            if condition.value:
+                if isinstance(else_expression, expr.Literal):
+                    return then_expression
+            elif isinstance(then_expression, expr.Literal):
+                return else_expression
+        return expression
+
+
+class Normalizer(stmt.Visitor[None]):
+    """Lower comma expressions in statement position into statements.
+
+    A comma expression whose value is discarded is no different from a
+    sequence of expression statements. Splice such statements into the
+    enclosing block so the interpreter executes each operand directly
+    instead of dispatching on the `expr.Comma` node first.
+
+    Statements at the top level are left untouched because the REPL
+    outputs the value of an expression statement, and splitting it would
+    output the value of each operand instead.
+
+    Methods
+    -------
+    normalize() : None
+        Lower comma expressions in nested blocks of given statements
+    """
+
+    def normalize(self, statements: list[stmt.Stmt]) -> None:
+        """Lower comma expressions in nested blocks of given statements."""
+        for statement in statements:
+            statement.accept(self)
+
+    def normalize_block(self, statements: list[stmt.Stmt]) -> None:
+        """Lower comma expressions in a block, splicing them in place."""
+        normalized: list[stmt.Stmt] = []
+        for statement in statements:
+            if isinstance(statement, stmt.Expression) and isinstance(
+                statement.expression, expr.Comma
+            ):
+                normalized.extend(
+                    stmt.Expression(operand)
+                    for operand in self.flatten(statement.expression)
+                )
+            else:
+                statement.accept(self)
+                normalized.append(statement)
+        statements[:] = normalized
+
+    def flatten(self, expression: expr.Expr) -> list[expr.Expr]:
+        """Return operands of a chain of comma expressions in order."""
+        operands = []
+        while isinstance(expression, expr.Comma):
+            operands.append(expression.right)
+            expression = expression.left
+        operands.append(expression)
+        operands.reverse()
+        return operands
+
+    def visit_block_stmt(self, statement: stmt.Block) -> None:
+        self.normalize_block(statement.statements)
+
+    def visit_class_stmt(self, statement: stmt.Class) -> None:
+        for method in statement.methods:
+            self.normalize_block(method.body)
+
+    def visit_expression_stmt(self, statement: stmt.Expression) -> None:
+        return
+
+    def visit_function_stmt(self, statement: stmt.Function) -> None:
+        self.normalize_block(statement.body)
+
+    def visit_if_stmt(self, statement: stmt.If) -> None:
+        statement.then_branch.accept(self)
+        if statement.else_branch is not None:
+            statement.else_branch.accept(self)
+
+    def visit_print_stmt(self, statement: stmt.Print) -> None:
+        return
+
+    def visit_return_stmt(self, statement: stmt.Return) -> None:
+        return
+
+    def visit_break_stmt(self, statement: stmt.Break) -> None:
+        return
+
+    def visit_while_stmt(self, statement: stmt.While) -> None:
+        statement.body.accept(self)
+
+    def visit_var_stmt(self, statement: stmt.Var) -> None:
+        return
@@ -1,4 +1,6 @@
-from typing import NoReturn
+from __future__ import annotations
+from array import array
+from typing import Callable, TypeVar
 
 from plox import expr
 from plox import lox
@@ -6,6 +8,107 @@ from plox import stmt
 from plox.tokens import Token, TokenType
 
 
+# Plain ints for the token types that the methods of the parser test. The
+# parser compares them against its column of types, and loading a global
+# is many times cheaper than loading a member of the enum class.
+LEFT_PAREN = int(TokenType.LEFT_PAREN)
+RIGHT_PAREN = int(TokenType.RIGHT_PAREN)
+LEFT_BRACE = int(TokenType.LEFT_BRACE)
+RIGHT_BRACE = int(TokenType.RIGHT_BRACE)
+COMMA = int(TokenType.COMMA)
+DOT = int(TokenType.DOT)
+SEMICOLON = int(TokenType.SEMICOLON)
+QMARK = int(TokenType.QMARK)
+COLON = int(TokenType.COLON)
+EQUAL = int(TokenType.EQUAL)
+LESSER = int(TokenType.LESSER)
+IDENTIFIER = int(TokenType.IDENTIFIER)
+AND = int(TokenType.AND)
+ELSE = int(TokenType.ELSE)
+OR = int(TokenType.OR)
+TRUE = int(TokenType.TRUE)
+VAR = int(TokenType.VAR)
+
+
+def token_mask(*token_types: TokenType) -> int:
+    """Return a bitmask with one bit set for each given token type.
+
+    Test a token against several types at once with
+    `(1 << token.token_type) & mask`, which avoids the loop in match().
+    """
+    mask = 0
+    for token_type in token_types:
+        mask |= 1 << token_type
+    return mask
+
+
+R = TypeVar("R")
+
+
+def rule_table(rules: dict[TokenType, R]) -> tuple[R | None, ...]:
+    """Return a tuple that holds the rule of each token type at its index.
+
+    Indexing a tuple with the type of the current token finds its rule
+    without the method call and hashing of a dictionary lookup.
+    """
+    table: list[R | None] = [None] * (max(TokenType) + 1)
+    for token_type, rule in rules.items():
+        table[token_type] = rule
+    return tuple(table)
+
+
+EQUALITY_MASK = token_mask(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL)
+COMPARISON_MASK = token_mask(
+    TokenType.GREATER,
+    TokenType.GREATER_EQUAL,
+    TokenType.LESSER,
+    TokenType.LESSER_EQUAL,
+)
+TERM_MASK = token_mask(TokenType.MINUS, TokenType.PLUS)
+FACTOR_MASK = token_mask(TokenType.SLASH, TokenType.STAR)
+UNARY_MASK = token_mask(TokenType.BANG, TokenType.MINUS)
+CALL_MASK = token_mask(TokenType.LEFT_PAREN, TokenType.DOT)
+
+# Nothing modifies a literal once it is built, so every occurrence of
+# `true`, `false`, or `nil` in source shares one node.
+LITERAL_TRUE = expr.Literal(True)
+LITERAL_FALSE = expr.Literal(False)
+LITERAL_NIL = expr.Literal(None)
+
+# Keywords that begin a statement, where the parser resumes after an error.
+SYNC_TYPES = frozenset({
+    TokenType.CLASS,
+    TokenType.FOR,
+    TokenType.FUN,
+    TokenType.IF,
+    TokenType.PRINT,
+    TokenType.RETURN,
+    TokenType.VAR,
+    TokenType.WHILE,
+})
+
+
+def left_associative(
+    operand: Callable[[Parser], expr.Expr], mask: int
+) -> Callable[[Parser], expr.Expr]:
+    """Return a rule for a left-associative binary operator.
+
+    The rule parses an operand with `operand`, and then, as long as the
+    type of the current token is set in `mask`, an operator and another
+    operand, joining the two sides into a binary expression.
+    """
+    def rule(self: Parser) -> expr.Expr:
+        expression = operand(self)
+        while (1 << self.current_type) & mask:
+            operator = self.tokens[self.current]
+            self.current += 1
+            self.current_type = self.types[self.current]
+            right = operand(self)
+            expression = expr.Binary(expression, operator, right)
+        return expression
+    return rule
+
+
 class Parser:
     """A recursive descent parser for Lox.
 
@@ -15,13 +118,27 @@ class Parser:
     ----------
     tokens : list[Token]
         Sequence of tokens passed from scanner
+    types : array[int], optional
+        Type of each token in `tokens` as produced by the scanner, derived
+        from the tokens if not given
 
     Attributes
     ----------
     tokens : list[Token]
         Sequence of tokens passed from Scanner
+    types : array[int]
+        Type of each token in `tokens`, stored apart from the tokens so
+        lookahead compares integers rather than loads attributes
     current : int
         Index of current token being parsed in sequence of tokens
+    current_type : int
+        Type of current token being parsed
+    eof_index : int
+        Index of the EOF token that ends every sequence of tokens
+    panic : bool
+        Flag set from a syntax error until the parser synchronizes
+    panic_position : int
+        Index of current token at the time of the last syntax error
 
     Methods
     -------
@@ -110,9 +227,33 @@ class Parser:
     var        -> IDENTIFIER ( "=" conditional )? ;
     """
 
-    def __init__(self, tokens: list[Token]) -> None:
-        self.tokens = tokens
-        self.current = 0
+    # Fix the layout of instances since each method of the grammar reads
+    # these attributes, often several times per token.
+    __slots__ = (
+        "tokens",
+        "types",
+        "current",
+        "current_type",
+        "eof_index",
+        "panic",
+        "panic_position",
+    )
+
+    def __init__(self, tokens: list[Token], types: array[int] | None = None) -> None:
+        self.tokens: list[Token] = tokens
+        if types is None:
+            types = array("i", [token.token_type for token in tokens])
+        self.types: array[int] = types
+        self.current: int = 0
+        # Type of the token at the cursor. Only code that moves the cursor
+        # updates it, so checks against the current token need not index
+        # the column of types each time.
+        self.current_type: int = self.types[0]
+        # The scanner always ends the sequence with EOF, so the end is
+        # known by position alone.
+        self.eof_index: int = len(tokens) - 1
+        self.panic: bool = False
+        self.panic_position: int = 0
 
     def parse(self) -> list[stmt.Stmt]:
         """Produce a sequence of statements to interpret.
@@ -125,131 +266,137 @@ class Parser:
             A sequence of statements parsed from `tokens`
         """
         statements: list[stmt.Stmt] = []
+        append = statements.append
         while not self.is_at_end():
-            statements.append(self.declaration())
+            append(self.declaration())
         return statements
 
     def declaration(self) -> stmt.Stmt:
-        try:
-            if self.match(TokenType.CLASS):
-                return self.class_declaration()
-            if self.match(TokenType.FUN):
-                return self.function_declaration("function")
-            if self.match(TokenType.VAR):
-                return self.var_declaration()
-            return self.statement()
-        except LoxParserError:
+        # Declarations share one table with the statements so that either
+        # one is found with a single lookup.
+        if (rule := DECLARATION_RULES[self.current_type]) is not None:
+            self.current += 1
+            self.current_type = self.types[self.current]
+            declaration = rule(self)
+        else:
+            declaration = self.expression_statement()
+
+        if self.panic:
             self.synchronize()
-        return None
+            return None
+        return declaration
 
     def class_declaration(self) -> stmt.Stmt:
-        name = self.consume(TokenType.IDENTIFIER, "expect class name")
+        name = self.consume(IDENTIFIER, "expect class name")
 
-        if self.match(TokenType.LESSER):
-            self.consume(TokenType.IDENTIFIER, "expect superclass name")
+        if self.match(LESSER):
+            self.consume(IDENTIFIER, "expect superclass name")
             superclass = expr.Variable(self.previous())
         else:
             superclass = None
 
-        self.consume(TokenType.LEFT_BRACE, "expect '{' before class body")
+        self.consume(LEFT_BRACE, "expect '{' before class body")
 
         methods: list[stmt.Function] = []
-        while not self.check(TokenType.RIGHT_BRACE) and not self.is_at_end():
-            methods.append(self.function_declaration("method"))
+        append = methods.append
+        while (
+            not self.panic and
+            not self.check(RIGHT_BRACE) and
+            not self.is_at_end()
+        ):
+            append(self.function_declaration("method"))
 
-        self.consume(TokenType.RIGHT_BRACE, "expect '}' after class body")
+        self.consume(RIGHT_BRACE, "expect '}' after class body")
         return stmt.Class(name, superclass, methods)
 
+    def fun_declaration(self) -> stmt.Stmt:
+        return self.function_declaration("function")
+
     def function_declaration(self, kind: str) -> stmt.Function:
-        name = self.consume(TokenType.IDENTIFIER, f"expect {kind} name.")
-        self.consume(TokenType.LEFT_PAREN, f"expect '(' after {kind} name.")
+        name = self.consume(IDENTIFIER, f"expect {kind} name.")
+        self.consume(LEFT_PAREN, f"expect '(' after {kind} name.")
 
         parameters: list[Token] = []
-        if not self.check(TokenType.RIGHT_PAREN):
-            parameters.append(self.consume(TokenType.IDENTIFIER, "expect parameter name"))
-            while self.match(TokenType.COMMA):
+        if not self.check(RIGHT_PAREN):
+            append = parameters.append
+            append(self.consume(IDENTIFIER, "expect parameter name"))
+            while self.match(COMMA):
                 if len(parameters) >= 255:
                     self.error(self.peek(), "cannot exceed 255 parameters")
-                parameters.append(self.consume(TokenType.IDENTIFIER, "expect parameter name"))
-        self.consume(TokenType.RIGHT_PAREN, "expect ')' after parameters")
+                append(self.consume(IDENTIFIER, "expect parameter name"))
+        self.consume(RIGHT_PAREN, "expect ')' after parameters")
 
-        self.consume(TokenType.LEFT_BRACE, f"expect '{{' before {kind} body")
+        self.consume(LEFT_BRACE, f"expect '{{' before {kind} body")
         body = self.block()
 
         return stmt.Function(name, parameters, body)
 
     def var_declaration(self) -> stmt.Stmt:
         variables: dict[Token, expr.Expr] = {}
+        names: set[str] = set()
 
         while True:
-            name = self.consume(TokenType.IDENTIFIER, "expect variable name")
-            if self.match(TokenType.EQUAL):
+            name = self.consume(IDENTIFIER, "expect variable name")
+            if self.match(EQUAL):
                 initializer = self.conditional()
             else:
                 initializer = None
 
-            if name.lexeme not in map(lambda name: name.lexeme, variables):
+            if self.panic:
+                break
+            if name.lexeme not in names:
+                names.add(name.lexeme)
                 variables[name] = initializer
             else:
                 self.error(name, "reuse of same variable in declaration")
 
-            if not self.match(TokenType.COMMA):
+            if not self.match(COMMA):
                 break
 
-        self.consume(TokenType.SEMICOLON, "expect ';' after variable declaration")
+        self.consume(SEMICOLON, "expect ';' after variable declaration")
         return stmt.Var(variables)
 
     def statement(self) -> stmt.Stmt:
-        if self.match(TokenType.FOR):
-            return self.for_statement()
-        if self.match(TokenType.IF):
-            return self.if_statement()
-        if self.match(TokenType.PRINT):
-            return self.print_statement()
-        if self.match(TokenType.RETURN):
-            return self.return_statement()
-        if self.match(TokenType.BREAK):
-            return self.break_statement()
-        if self.match(TokenType.WHILE):
-            return self.while_statement()
-        if self.match(TokenType.LEFT_BRACE):
-            return stmt.Block(self.block())
+        if (rule := STATEMENT_RULES[self.current_type]) is not None:
+            self.current += 1
+            self.current_type = self.types[self.current]
+            return rule(self)
         return self.expression_statement()
 
     def expression_statement(self) -> stmt.Stmt:
         expression = self.expression()
         # The semicolon is optional. Consume it if it exists, or simply continue.
-        self.match(TokenType.SEMICOLON)
+        self.match(SEMICOLON)
         return stmt.Expression(expression)
 
     def for_statement(self) -> stmt.Stmt:
-        self.consume(TokenType.LEFT_PAREN, "expect '(' after 'while'")
+        self.consume(LEFT_PAREN, "expect '(' after 'while'")
 
-        if self.match(TokenType.SEMICOLON):
+        if self.match(SEMICOLON):
             initializer = None
-        elif self.match(TokenType.VAR):
+        elif self.match(VAR):
             initializer = self.var_declaration()
         else:
             initializer = self.expression_statement()
 
-        if not self.check(TokenType.SEMICOLON):
+        if not self.check(SEMICOLON):
             condition = self.expression()
         else:
             condition = None
-        self.consume(TokenType.SEMICOLON, "expect ';' after loop condition")
+        self.consume(SEMICOLON, "expect ';' after loop condition")
 
-        if not self.check(TokenType.RIGHT_PAREN):
+        if not self.check(RIGHT_PAREN):
             increment = self.expression()
         else:
             increment = None
-        self.consume(TokenType.RIGHT_PAREN, "expect ')' after for clauses")
+        self.consume(RIGHT_PAREN, "expect ')' after for clauses")
 
         body = self.statement()
         if increment:
             body = stmt.Block([body, stmt.Expression(increment)])
 
         if condition is None:
-            condition = expr.Literal(True)
+            condition = LITERAL_TRUE
         body = stmt.While(condition, body)
 
         if initializer is not None:
@@ -258,50 +405,58 @@ class Parser:
         return body
 
     def if_statement(self) -> stmt.Stmt:
-        self.consume(TokenType.LEFT_PAREN, "expect '(' after 'if'")
+        self.consume(LEFT_PAREN, "expect '(' after 'if'")
         condition = self.expression()
-        self.consume(TokenType.RIGHT_PAREN, "expect ')' after if condition")
+        self.consume(RIGHT_PAREN, "expect ')' after if condition")
 
         then_branch = self.statement()
         else_branch = None
-        if self.match(TokenType.ELSE):
+        if self.match(ELSE):
             else_branch = self.statement()
 
         return stmt.If(condition, then_branch, else_branch)
 
     def print_statement(self) -> stmt.Stmt:
         value = self.expression()
-        self.consume(TokenType.SEMICOLON, "expect ';' after value")
+        self.consume(SEMICOLON, "expect ';' after value")
         return stmt.Print(value)
 
     def return_statement(self) -> stmt.Stmt:
         keyword = self.previous()
-        if not self.check(TokenType.SEMICOLON):
+        if not self.check(SEMICOLON):
             value = self.expression()
         else:
             value = None
 
-        self.consume(TokenType.SEMICOLON, "expect ';' after return value")
+        self.consume(SEMICOLON, "expect ';' after return value")
         return stmt.Return(keyword, value)
 
     def break_statement(self) -> stmt.Stmt:
         keyword = self.previous()
-        self.consume(TokenType.SEMICOLON, "expect ';' after break statement")
+        self.consume(SEMICOLON, "expect ';' after break statement")
         return stmt.Break(keyword)
 
     def while_statement(self) -> stmt.Stmt:
-        self.consume(TokenType.LEFT_PAREN, "expect '(' after 'while'")
+        self.consume(LEFT_PAREN, "expect '(' after 'while'")
         condition = self.expression()
-        self.consume(TokenType.RIGHT_PAREN, "expect ')' after condition")
+        self.consume(RIGHT_PAREN, "expect ')' after condition")
         body = self.statement()
         return stmt.While(condition, body)
 
+    def block_statement(self) -> stmt.Stmt:
+        return stmt.Block(self.block())
+
     def block(self) -> list[stmt.Stmt]:
-        statements = []
-        while not self.check(TokenType.RIGHT_BRACE) and not self.is_at_end():
-            statements.append(self.declaration())
+        statements: list[stmt.Stmt] = []
+        append = statements.append
+        while (
+            not self.panic and
+            not self.check(RIGHT_BRACE) and
+            not self.is_at_end()
+        ):
+            append(self.declaration())
 
-        self.consume(TokenType.RIGHT_BRACE, "expect '}' after block")
+        self.consume(RIGHT_BRACE, "expect '}' after block")
         return statements
 
     def expression(self) -> expr.Expr:
@@ -309,23 +464,23 @@ class Parser:
 
     def comma(self) -> expr.Expr:
         expression = self.conditional()
-        while self.match(TokenType.COMMA):
+        while self.match(COMMA):
             right = self.conditional()
             expression = expr.Comma(expression, right)
         return expression
 
     def conditional(self) -> expr.Expr:
         expression = self.assignment()
-        if self.match(TokenType.QMARK):
+        if self.match(QMARK):
             then_expression = self.logical_or()
-            self.consume(TokenType.COLON, "expect ':' after first expression")
+            self.consume(COLON, "expect ':' after first expression")
             else_expression = self.conditional()
             expression = expr.Conditional(expression, then_expression, else_expression)
         return expression
 
     def assignment(self) -> expr.Expr:
         expression = self.logical_or()
-        if self.match(TokenType.EQUAL):
+        if self.match(EQUAL):
             equals = self.previous()
             value = self.assignment()
 
@@ -339,7 +494,7 @@ class Parser:
 
     def logical_or(self) -> expr.Expr:
         expression = self.logical_and()
-        while self.match(TokenType.OR):
+        while self.match(OR):
             operator = self.previous()
             right = self.logical_and()
             expression = expr.Logical(expression, operator, right)
@@ -347,141 +502,138 @@ class Parser:
 
     def logical_and(self) -> expr.Expr:
         expression = self.equality()
-        while self.match(TokenType.AND):
+        while self.match(AND):
             operator = self.previous()
             right = self.equality()
             expression = expr.Logical(expression, operator, right)
         return expression
 
-    def equality(self) -> expr.Expr:
-        expression = self.comparison()
-        while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-            operator = self.previous()
-            right = self.comparison()
-            expression = expr.Binary(expression, operator, right)
-        return expression
-
-    def comparison(self) -> expr.Expr:
-        expression = self.term()
-        while self.match(
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESSER,
-            TokenType.LESSER_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.term()
-            expression = expr.Binary(expression, operator, right)
-        return expression
-
-    def term(self) -> expr.Expr:
-        expression = self.factor()
-        while self.match(TokenType.MINUS, TokenType.PLUS):
-            operator = self.previous()
-            right = self.factor()
-            expression = expr.Binary(expression, operator, right)
-        return expression
-
-    def factor(self) -> expr.Expr:
-        expression = self.unary()
-        while self.match(TokenType.SLASH, TokenType.STAR):
-            operator = self.previous()
-            right = self.unary()
-            expression = expr.Binary(expression, operator, right)
-        return expression
+    # The methods for binary and unary operators test the current token
+    # against a bitmask of their operators and consume it inline. They run
+    # for every operand in the source, so they avoid the tuple of arguments
+    # and the loop of match() as well as the calls to check() and advance().
+    # EOF is never part of a mask, so the cursor never moves past the end.
 
     def unary(self) -> expr.Expr:
-        if self.match(TokenType.BANG, TokenType.MINUS):
-            operator = self.previous()
+        if (1 << self.current_type) & UNARY_MASK:
+            operator = self.tokens[self.current]
+            self.current += 1
+            self.current_type = self.types[self.current]
             right = self.unary()
             return expr.Unary(operator, right)
         return self.call()
 
+    # The rules of left-associative binary operators differ only in their
+    # operators and the rule of their operands, so build them from one
+    # template. Each calls the function of its operand directly rather
+    # than look up a method on the instance.
+    factor = left_associative(unary, FACTOR_MASK)
+    term = left_associative(factor, TERM_MASK)
+    comparison = left_associative(term, COMPARISON_MASK)
+    equality = left_associative(comparison, EQUALITY_MASK)
+
     def finish_call(self, callee: expr.Expr) -> expr.Expr:
-        arguments = []
-        if not self.check(TokenType.RIGHT_PAREN):
-            arguments.append(self.conditional())
-            while self.match(TokenType.COMMA):
+        arguments: list[expr.Expr] = []
+        if not self.check(RIGHT_PAREN):
+            append = arguments.append
+            append(self.conditional())
+            while self.match(COMMA):
                 if len(arguments) >= 255:
                     self.error(self.peek(), "cannot exceed 255 arguments")
-                arguments.append(self.conditional())
+                append(self.conditional())
 
-        paren = self.consume(TokenType.RIGHT_PAREN, "expect ')' after arguments")
+        paren = self.consume(RIGHT_PAREN, "expect ')' after arguments")
         return expr.Call(callee, paren, arguments)
 
     def call(self) -> expr.Expr:
         expression = self.primary()
-        while True:
-            if self.match(TokenType.LEFT_PAREN):
+        # Most primary expressions are neither called nor accessed, so
+        # test for both at once and fetch the type of the token only once.
+        while (1 << (token_type := self.current_type)) & CALL_MASK:
+            self.current += 1
+            self.current_type = self.types[self.current]
+            if token_type == LEFT_PAREN:
                 expression = self.finish_call(expression)
-            if self.match(TokenType.DOT):
-                name = self.consume(TokenType.IDENTIFIER, "expect property name after '.'")
-                expression = expr.Get(expression, name)
             else:
-                break
+                name = self.consume(IDENTIFIER, "expect property name after '.'")
+                expression = expr.Get(expression, name)
         return expression
 
     def primary(self) -> expr.Expr:
-        if self.match(TokenType.FALSE):
-            return expr.Literal(False)
-        elif self.match(TokenType.TRUE):
-            return expr.Literal(True)
-        elif self.match(TokenType.NIL):
-            return expr.Literal(None)
+        if (rule := PRIMARY_RULES[self.current_type]) is not None:
+            self.current += 1
+            self.current_type = self.types[self.current]
+            return rule(self)
 
-        if self.match(TokenType.NUMBER, TokenType.STRING):
-            return expr.Literal(self.previous().literal)
+        self.error(self.peek(), "expected expression")
+        return None
 
-        if self.match(TokenType.SUPER):
-            keyword = self.previous()
-            self.consume(TokenType.DOT, "expect '.' after 'super'");
-            method = self.consume(TokenType.IDENTIFIER, "expect superclass method name")
-            return expr.Super(keyword, method)
+    def boolean(self) -> expr.Expr:
+        return LITERAL_TRUE if self.types[self.current - 1] == TRUE else LITERAL_FALSE
 
-        if self.match(TokenType.THIS):
-            return expr.This(self.previous())
+    def nil(self) -> expr.Expr:
+        return LITERAL_NIL
 
-        if self.match(TokenType.IDENTIFIER):
-            return expr.Variable(self.previous())
+    def literal(self) -> expr.Expr:
+        return expr.Literal(self.previous().literal)
 
-        if self.match(TokenType.LEFT_PAREN):
-            expression = self.expression()
-            self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
-            return expr.Grouping(expression)
+    def super_expression(self) -> expr.Expr:
+        keyword = self.previous()
+        self.consume(DOT, "expect '.' after 'super'");
+        method = self.consume(IDENTIFIER, "expect superclass method name")
+        return expr.Super(keyword, method)
 
-        self.error(self.peek(), "expected expression")
-        return None
+    def this_expression(self) -> expr.Expr:
+        return expr.This(self.previous())
 
+    def variable(self) -> expr.Expr:
+        return expr.Variable(self.previous())
 
-    def match(self, *token_types: TokenType) -> bool:
-        """Consume next token if it matches at least one given type."""
-        for token_type in token_types:
-            if self.check(token_type):
-                self.advance()
-                return True
+    def grouping(self) -> expr.Expr:
+        expression = self.expression()
+        self.consume(RIGHT_PAREN, "Expect ')' after expression.")
+        return expr.Grouping(expression)
+
+    def match(self, token_type: int) -> bool:
+        """Consume next token if it matches given type."""
+        # Rules that accept one of several types test a mask instead, so
+        # this only ever needs to test one type.
+        if self.current_type == token_type:
+            self.current += 1
+            self.current_type = self.types[self.current]
+            return True
         return False
 
-    def consume(self, token_type: TokenType, message: str) -> Token:
+    def consume(self, token_type: int, message: str) -> Token:
         """Register a token as parsed and progress to the next."""
-        if self.check(token_type):
-            return self.advance()
-        self.error(self.peek(), message)
-
-    def check(self, token_type: TokenType) -> bool:
+        # The token is in hand already, so take it and move the cursor here
+        # rather than through check(), advance(), and previous().
+        if self.current_type == token_type:
+            token = self.tokens[self.current]
+            self.current += 1
+            self.current_type = self.types[self.current]
+            return token
+        # Hand back the unexpected token in place of the expected one. The
+        # parser is in panic mode, so the tree it builds is discarded.
+        token = self.peek()
+        self.error(token, message)
+        return token
+
+    def check(self, token_type: int) -> bool:
         """Check that token matches given type without consuming it."""
-        if self.is_at_end():
-            return False
-        return self.peek().token_type == token_type
+        # No rule checks for EOF itself, so the comparison alone suffices.
+        return self.current_type == token_type
 
     def advance(self) -> Token:
         """Consume current token and progress to the next."""
         if not self.is_at_end():
             self.current += 1
+            self.current_type = self.types[self.current]
         return self.previous()
 
     def is_at_end(self) -> bool:
         """Confirm all tokens have been parsed."""
-        return self.peek().token_type == TokenType.EOF
+        return self.current >= self.eof_index
 
     def peek(self) -> Token:
         """Return the current token without consuming it."""
@@ -491,17 +643,22 @@ class Parser:
         """Return the previous token consumed."""
         return self.tokens[self.current - 1]
 
-    def error(self, token: Token, message: str) -> NoReturn:
-        """Raise exception to create a point from which to synchronize.
+    def error(self, token: Token, message: str) -> None:
+        """Enter panic mode to create a point from which to synchronize.
 
-        First output an error message. Then, raise an exception when the
-        parser stumbles across a syntax error to unwind the stack. At
-        some point along the unwind, in this case in method
-        declaration(), use the exception as a means to recover the state
-        of the parser and minimize cascaded errors.
+        First output an error message. Then, mark the position at which
+        the parser stumbled across the syntax error and set the panic
+        flag. Until the enclosing declaration completes, the parser
+        reports no further errors and parses no further declarations,
+        so the remainder of the statement only returns to method
+        declaration(). There, use the marked position as a means to
+        recover the state of the parser and minimize cascaded errors.
         """
+        if self.panic:
+            return
         lox.error(token, message)
-        raise LoxParserError()
+        self.panic = True
+        self.panic_position = self.current
 
     def synchronize(self) -> None:
         """Recover the state of the parser after a syntax error.
@@ -509,28 +666,57 @@ class Parser:
         If a statement contains a syntax error, skip it. To restore the
         state of the parser, reduce cascading errors, and avoid a crash,
         find the beginning of the next statement and continue.
+
+        Tokens consumed after the error are never part of a valid tree,
+        so search for the beginning from the position of the error.
         """
+        self.panic = False
+        self.current = self.panic_position
+        self.current_type = self.types[self.current]
         self.advance()
         while not self.is_at_end():
-            if self.previous().token_type == TokenType.SEMICOLON:
+            if self.types[self.current - 1] == SEMICOLON:
                 return
 
-            match self.peek().token_type:
-                case (
-                    TokenType.CLASS |
-                    TokenType.FOR |
-                    TokenType.FUN |
-                    TokenType.IF |
-                    TokenType.PRINT |
-                    TokenType.RETURN |
-                    TokenType.VAR |
-                    TokenType.WHILE
-                ):
-                    return
+            if self.current_type in SYNC_TYPES:
+                return
 
             self.advance()
 
 
-class LoxParserError(Exception):
-    """An empty exception to trigger synchronization upon error."""
-    pass
+# The first token of a declaration, a statement, or a primary expression
+# decides its rule, so look the rule up once rather than try to match each
+# token in turn. The tables hold plain functions, built once for every
+# parser.
+STATEMENT_RULES: tuple[Callable[[Parser], stmt.Stmt] | None, ...] = rule_table({
+    TokenType.FOR: Parser.for_statement,
+    TokenType.IF: Parser.if_statement,
+    TokenType.PRINT: Parser.print_statement,
+    TokenType.RETURN: Parser.return_statement,
+    TokenType.BREAK: Parser.break_statement,
+    TokenType.WHILE: Parser.while_statement,
+    TokenType.LEFT_BRACE: Parser.block_statement,
+})
+PRIMARY_RULES: tuple[Callable[[Parser], expr.Expr] | None, ...] = rule_table({
+    TokenType.FALSE: Parser.boolean,
+    TokenType.TRUE: Parser.boolean,
+    TokenType.NIL: Parser.nil,
+    TokenType.NUMBER: Parser.literal,
+    TokenType.STRING: Parser.literal,
+    TokenType.SUPER: Parser.super_expression,
+    TokenType.THIS: Parser.this_expression,
+    TokenType.IDENTIFIER: Parser.variable,
+    TokenType.LEFT_PAREN: Parser.grouping,
+})
+DECLARATION_RULES: tuple[Callable[[Parser], stmt.Stmt] | None, ...] = rule_table({
+    TokenType.CLASS: Parser.class_declaration,
+    TokenType.FUN: Parser.fun_declaration,
+    TokenType.VAR: Parser.var_declaration,
+    TokenType.FOR: Parser.for_statement,
+    TokenType.IF: Parser.if_statement,
+    TokenType.PRINT: Parser.print_statement,
+    TokenType.RETURN: Parser.return_statement,
+    TokenType.BREAK: Parser.break_statement,
+    TokenType.WHILE: Parser.while_statement,
+    TokenType.LEFT_BRACE: Parser.block_statement,
+})
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import auto, IntEnum, unique
+from typing import Any, Callable
 
 from plox import expr
 from plox import lox
@@ -9,12 +10,18 @@ from plox import tokens
 from plox.interpreter import Interpreter
 
 
-@dataclass
+@dataclass(slots=True)
 class LocalVariableState:
-    """Store state when resolving local variables."""
+    """Store state when resolving local variables.
+
+    The resolver creates one for each local variable it declares, so give
+    instances slots rather than a dictionary each. `depth` is the index
+    in the stack of scopes of the scope that declares the variable.
+    """
     ready: bool = False
     used: bool = False
     line_number: int = 0
+    depth: int = 0
 
 
 class FunctionType(IntEnum):
@@ -58,18 +65,29 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
     ---------
     interpreter : Interpreter
         An instance of Interpreter
-    scopes : list[dict[str, LocalVariableState]]
-        Stack of scopes, where keys of each scope represent variables
-        and their corresponding values represent the state of resolution
-        of the local variable. As index of list increases, nesting of
-        scope increases as well; that is, the last entry in the list
-        represents the innermost scope.
+    scopes : list[list[str]]
+        Stack of scopes, where each scope lists the names of the local
+        variables it declares in order of declaration. As index of list
+        increases, nesting of scope increases as well; that is, the last
+        entry in the list represents the innermost scope.
+    declarations : dict[str, list[LocalVariableState]]
+        Map of names of local variables to the state of resolution of
+        each declaration of the name in the current stack of scopes,
+        innermost last, so resolving a use of a variable needs no search
+        through the stack of scopes
     current_function : FunctionType
         Specify current function scope
     current_class : ClassType
         Specify current class scope
     loop_status : bool
         Indicate current scope exists directly within a loop
+    resolved : list[expr.Expr | stmt.While]
+        Nodes whose resolution was stored in the interpreter, so it may
+        forget them once their syntax trees are no longer run
+    expression_visitors : dict[type[expr.Expr], Callable[[expr.Expr], None]]
+        Map of types of expressions to bound methods that visit them
+    statement_visitors : dict[type[stmt.Stmt], Callable[[stmt.Stmt], None]]
+        Map of types of statements to bound methods that visit them
 
     Methods
     -------
@@ -89,22 +107,58 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
     """
 
     def __init__(self, interpreter: Interpreter) -> None:
-        self.interpreter = interpreter
-        self.scopes: list[dict[str, LocalVariableState]] = []
-        self.current_function = FunctionType.NONE
-        self.current_class = ClassType.NONE
-        self.loop_status = False
-
-    def resolve(self, item: list[stmt.Stmt] | stmt.Stmt | expr.Expr) -> None:
+        self.interpreter: Interpreter = interpreter
+        self.scopes: list[list[str]] = []
+        self.declarations: dict[str, list[LocalVariableState]] = {}
+        self.current_function: FunctionType = FunctionType.NONE
+        self.current_class: ClassType = ClassType.NONE
+        self.loop_status: bool = False
+        self.resolved: list[expr.Expr | stmt.While] = []
+
+        # As in the interpreter, bind each visitor method once so nodes are
+        # dispatched with a single lookup rather than through accept().
+        self.expression_visitors: dict[type[expr.Expr], Callable[[Any], None]] = {
+            expr.Assign: self.visit_assign_expr,
+            expr.Binary: self.visit_binary_expr,
+            expr.Call: self.visit_call_expr,
+            expr.Get: self.visit_get_expr,
+            expr.Grouping: self.visit_grouping_expr,
+            expr.Literal: self.visit_literal_expr,
+            expr.Logical: self.visit_logical_expr,
+            expr.Set: self.visit_set_expr,
+            expr.Super: self.visit_super_expr,
+            expr.This: self.visit_this_expr,
+            expr.Unary: self.visit_unary_expr,
+            expr.Variable: self.visit_variable_expr,
+            expr.Comma: self.visit_comma_expr,
+            expr.Conditional: self.visit_conditional_expr,
+        }
+        self.statement_visitors: dict[type[stmt.Stmt], Callable[[Any], None]] = {
+            stmt.Block: self.visit_block_stmt,
+            stmt.Class: self.visit_class_stmt,
+            stmt.Expression: self.visit_expression_stmt,
+            stmt.Function: self.visit_function_stmt,
+            stmt.If: self.visit_if_stmt,
+            stmt.Print: self.visit_print_stmt,
+            stmt.Return: self.visit_return_stmt,
+            stmt.Break: self.visit_break_stmt,
+            stmt.While: self.visit_while_stmt,
+            stmt.Var: self.visit_var_stmt,
+        }
+
+    def resolve(self, statements: list[stmt.Stmt]) -> None:
         """Resolve variables for given statements."""
-        if isinstance(item, list):
-            statements = item
-            for statement in statements:
-                self.resolve(statement)
-        elif isinstance(item, stmt.Stmt) or isinstance(item, expr.Expr):
-            item.accept(self)
-        else:
-            raise TypeError
+        visitors = self.statement_visitors
+        for statement in statements:
+            visitors[type(statement)](statement)
+
+    def resolve_stmt(self, statement: stmt.Stmt) -> None:
+        """Resolve variables for a single statement."""
+        self.statement_visitors[type(statement)](statement)
+
+    def resolve_expr(self, expression: expr.Expr) -> None:
+        """Resolve variables for a single expression."""
+        self.expression_visitors[type(expression)](expression)
 
     def resolve_function(self, function: stmt.Function, function_type: FunctionType) -> None:
         """Create and resolve scope for function declaration.
@@ -127,27 +181,31 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
     def resolve_local(self, expression: expr.Expr, name: tokens.Token) -> None:
         """Resolve the use of a local variable.
 
-        Begin at innermost scope and progress outward, checking each
-        scope for the variable name. If found, pass number of scopes
-        from that of the use of the variable to the interpreter. If not
-        found, assume the variable is global.
+        Find the innermost scope that declares the variable name. If
+        found, pass number of scopes from that of the use of the
+        variable to the interpreter. If not found, assume the variable
+        is global.
         """
-        for i in range(len(self.scopes) - 1, -1, -1):
-            if name.lexeme in self.scopes[i]:
-                self.scopes[i][name.lexeme].used = True
-                self.interpreter.resolve(expression, len(self.scopes) - 1 - i)
-                return
+        if declarations := self.declarations.get(name.lexeme):
+            variable = declarations[-1]
+            variable.used = True
+            self.interpreter.resolve(expression, len(self.scopes) - 1 - variable.depth)
+        else:
+            self.interpreter.resolve_global(expression, name)
+        self.resolved.append(expression)
 
     def begin_scope(self) -> None:
         """Create and push new scope onto stack of scopes."""
-        self.scopes.append({})
+        self.scopes.append([])
 
     def end_scope(self) -> None:
         """Remove a used scope from stack of scopes."""
         scope = self.scopes.pop()
-        for name, variable_state in scope.items():
-            if variable_state.used is False:
-                lox.error(variable_state.line_number, f"local variable '{name}' was not used")
+        declarations = self.declarations
+        for name in scope:
+            variable = declarations[name].pop()
+            if variable.used is False:
+                lox.error(variable.line_number, f"local variable '{name}' was not used")
 
     def declare(self, name: tokens.Token) -> None:
         """Add variable to innermost scope.
@@ -155,12 +213,26 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
         Mark variable as declared but undefined with `False` -- it is
         not ready for use.
         """
-        if len(self.scopes) == 0:
+        if not (scopes := self.scopes):
             return
-        scope = self.scopes[-1]
-        if name.lexeme in scope:
+        depth = len(scopes) - 1
+        lexeme = name.lexeme
+        variable = LocalVariableState(line_number=name.line, depth=depth)
+        declarations = self.declarations.setdefault(lexeme, [])
+        if declarations and declarations[-1].depth == depth:
             lox.error(name, "a variable with this name already exists in this scope")
-        scope[name.lexeme] = LocalVariableState(line_number=name.line)
+            declarations[-1] = variable
+        else:
+            declarations.append(variable)
+            scopes[-1].append(lexeme)
+
+    def declare_keyword(self, keyword: str) -> None:
+        """Add `this` or `super` to innermost scope, ready and used."""
+        scopes = self.scopes
+        self.declarations.setdefault(keyword, []).append(
+            LocalVariableState(ready=True, used=True, depth=len(scopes) - 1)
+        )
+        scopes[-1].append(keyword)
 
     def define(self, name: tokens.Token) -> None:
         """Indicate a variable is declared, defined, and ready for use.
@@ -170,9 +242,8 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
 
         `True` indicates a variable is available for use.
         """
-        if len(self.scopes) == 0:
-            return
-        self.scopes[-1][name.lexeme].ready = True
+        if self.scopes:
+            self.declarations[name.lexeme][-1].ready = True
 
     def visit_block_stmt(self, statement: stmt.Block) -> None:
         """Create and resolve new scope for statements within block."""
@@ -184,23 +255,24 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
         enclosing_class = self.current_class
         self.current_class = ClassType.CLASS
 
-        self.declare(statement.name)
-        self.define(statement.name)
+        name = statement.name
+        self.declare(name)
+        self.define(name)
 
         if statement.superclass is not None:
-            if statement.name.lexeme == statement.superclass.name.lexeme:
+            if name.lexeme == statement.superclass.name.lexeme:
                 lox.error(statement.superclass.name, "a class cannot inherit from itself")
             self.current_class = ClassType.SUBCLASS
-            self.resolve(statement.superclass)
+            self.resolve_expr(statement.superclass)
 
             self.begin_scope()
             # A line number is not provided because `super` is declared and defined automatically.
-            self.scopes[-1]["super"] = LocalVariableState(ready=True, used=True)
+            self.declare_keyword("super")
 
         self.begin_scope()
         # As with `super`, a line number is not provided for `this` since it is
         # declared and defined automatically.
-        self.scopes[-1]["this"] = LocalVariableState(ready=True, used=True)
+        self.declare_keyword("this")
 
         for method in statement.methods:
             if method.name.lexeme == "init":
@@ -215,16 +287,16 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
         self.current_class = enclosing_class
 
     def visit_expression_stmt(self, statement: stmt.Expression) -> None:
-        self.resolve(statement.expression)
+        self.resolve_expr(statement.expression)
 
     def visit_if_stmt(self, statement: stmt.If) -> None:
-        self.resolve(statement.condition)
-        self.resolve(statement.then_branch)
+        self.resolve_expr(statement.condition)
+        self.resolve_stmt(statement.then_branch)
         if statement.else_branch is not None:
-            self.resolve(statement.else_branch)
+            self.resolve_stmt(statement.else_branch)
 
     def visit_print_stmt(self, statement: stmt.Print) -> None:
-        self.resolve(statement.expression)
+        self.resolve_expr(statement.expression)
 
     def visit_return_stmt(self, statement: stmt.Return) -> None:
         if self.current_function == FunctionType.NONE:
@@ -233,7 +305,7 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
         if statement.value is not None:
             if self.current_function == FunctionType.INITIALIZER:
                 lox.error(statement.keyword, "cannot return a value from an initializer")
-            self.resolve(statement.value)
+            self.resolve_expr(statement.value)
 
     def visit_break_stmt(self, statement: stmt.Break) -> None:
         if not self.loop_status:
@@ -242,51 +314,65 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
 
     def visit_while_stmt(self, statement: stmt.While) -> None:
         self.loop_status = True
-        self.resolve(statement.condition)
-        self.resolve(statement.body)
+        self.resolve_expr(statement.condition)
+        self.interpreter.resolve_loop(statement)
+        self.resolved.append(statement)
+        self.resolve_stmt(statement.body)
         self.loop_status = False
 
     def visit_function_stmt(self, statement: stmt.Function) -> None:
-        self.declare(statement.name)
-        self.define(statement.name)
+        name = statement.name
+        self.declare(name)
+        self.define(name)
         self.resolve_function(statement, FunctionType.FUNCTION)
 
     def visit_var_stmt(self, statement: stmt.Var) -> None:
         for name, initializer in statement.variables.items():
             self.declare(name)
             if initializer is not None:
-                self.resolve(initializer)
+                self.resolve_expr(initializer)
             self.define(name)
 
     def visit_assign_expr(self, expression: expr.Assign) -> None:
-        self.resolve(expression.value)
+        self.resolve_expr(expression.value)
         self.resolve_local(expression, expression.name)
 
     def visit_binary_expr(self, expression: expr.Binary) -> None:
-        self.resolve(expression.left)
-        self.resolve(expression.right)
+        # Operators, calls, and logical operators make up most expressions,
+        # so dispatch on their operands directly instead of through
+        # resolve_expr() to save a call per operand.
+        visitors = self.expression_visitors
+        left = expression.left
+        visitors[type(left)](left)
+        right = expression.right
+        visitors[type(right)](right)
 
     def visit_call_expr(self, expression: expr.Call) -> None:
-        self.resolve(expression.callee)
+        visitors = self.expression_visitors
+        callee = expression.callee
+        visitors[type(callee)](callee)
         for argument in expression.arguments:
-            self.resolve(argument)
+            visitors[type(argument)](argument)
 
     def visit_get_expr(self, expression: expr.Get) -> None:
-        self.resolve(expression.item)
+        self.resolve_expr(expression.item)
 
     def visit_grouping_expr(self, expression: expr.Grouping) -> None:
-        self.resolve(expression.expression)
+        self.resolve_expr(expression.expression)
 
     def visit_literal_expr(self, expression: expr.Literal) -> None:
         return
 
     def visit_logical_expr(self, expression: expr.Logical) -> None:
-        self.resolve(expression.left)
-        self.resolve(expression.right)
+        visitors = self.expression_visitors
+        left = expression.left
+        visitors[type(left)](left)
+        right = expression.right
+        visitors[type(right)](right)
 
     def visit_set_expr(self, expression: expr.Set) -> None:
-        self.resolve(expression.value)
-        self.resolve(expression.item)
+        self.resolve_expr(expression.value)
+        self.resolve_expr(expression.item)
 
     def visit_super_expr(self, expression: expr.Super) -> None:
         if self.current_class == ClassType.NONE:
@@ -302,22 +388,23 @@ class Resolver(expr.Visitor[None], stmt.Visitor[None]):
         self.resolve_local(expression, expression.keyword)
 
     def visit_unary_expr(self, expression: expr.Unary) -> None:
-        self.resolve(expression.right)
+        self.resolve_expr(expression.right)
 
     def visit_variable_expr(self, expression: expr.Variable) -> None:
+        name = expression.name
         if (
-            len(self.scopes) and
-            (variable := self.scopes[-1].get(expression.name.lexeme)) and
-            variable.ready is False
+            (declarations := self.declarations.get(name.lexeme)) and
+            (variable := declarations[-1]).ready is False and
+            variable.depth == len(self.scopes) - 1
         ):
-            lox.error(expression.name, "cannot use local variable in its own initializer")
-        self.resolve_local(expression, expression.name)
+            lox.error(name, "cannot use local variable in its own initializer")
+        self.resolve_local(expression, name)
 
     def visit_comma_expr(self, expression: expr.Comma) -> None:
-        self.resolve(expression.left)
-        self.resolve(expression.right)
+        self.resolve_expr(expression.left)
+        self.resolve_expr(expression.right)
 
     def visit_conditional_expr(self, expression: expr.Conditional) -> None:
-        self.resolve(expression.condition)
-        self.resolve(expression.then_expression)
-        self.resolve(expression.else_expression)
+        self.resolve_expr(expression.condition)
+        self.resolve_expr(expression.then_expression)
+        self.resolve_expr(expression.else_expression)
@@ -1,7 +1,35 @@
+import sys
+from array import array
+from string import ascii_letters, digits
+from typing import Callable
+
 from plox import lox
 from plox.tokens import Token, TokenType
 
 
+def character_mask(characters: str) -> bytearray:
+    """Return a table of ASCII codes with 1 for each given character."""
+    mask = bytearray(128)
+    for c in characters:
+        mask[ord(c)] = 1
+    return mask
+
+
+DIGIT = character_mask(digits)
+ALPHANUMERIC = character_mask(ascii_letters + "_" + digits)
+
+# Loading a member of an enum through its class is an order of magnitude
+# slower than loading a global, so bind the types that rules add for each
+# token to globals. Unlike in the parser, they remain members of the enum,
+# as tokens carry them to code that compares them by identity and reports
+# them by name.
+EOF = TokenType.EOF
+IDENTIFIER = TokenType.IDENTIFIER
+NUMBER = TokenType.NUMBER
+SLASH = TokenType.SLASH
+STRING = TokenType.STRING
+
+
 class Scanner:
     """A scanner for Lox that reads source code and outputs tokens.
 
@@ -16,6 +44,15 @@ class Scanner:
         Source code from a file or a REPL entry
     tokens : list[Token]
         Sequence of tokens produced from source
+    types : array[int]
+        Type of each token in `tokens`, produced alongside them for the
+        parser to look ahead on
+    words : dict[str, tuple[TokenType, str]]
+        Map of each keyword and each identifier scanned so far to its
+        token type and the string to use as its lexeme
+    strings : dict[str, str]
+        Map of each string literal scanned so far to the string that
+        every occurrence of the literal shares
     start : int
         Beginning of current token being scanned
     current : int
@@ -52,155 +89,200 @@ class Scanner:
     def __init__(self, source: str):
         self.source = source
         self.tokens: list[Token] = []
+        self.types = array("i")
+        self.words: dict[str, tuple[TokenType, str]] = {
+            keyword: (token_type, keyword)
+            for keyword, token_type in Scanner.keywords.items()
+        }
+        self.strings: dict[str, str] = {}
         self.start = 0
         self.current = 0
         self.line = 1
 
     def scan_tokens(self) -> list[Token]:
-        while not self.is_at_end():
-            self.start = self.current
-            self.scan_token()
-        self.tokens.append(Token(TokenType.EOF, "", None, self.line))
+        # Read the source and the rules through locals instead of attributes
+        # and calls on each character. Rules read and write the position
+        # through the scanner, so it is only exchanged at token boundaries.
+        source = self.source
+        end = len(source)
+        rules = SCAN_RULES
+        current = self.current
+        while current < end:
+            # Spaces outnumber any other character in most source, and runs
+            # of them indent most lines. Skip them here without a rule.
+            if (c := source[current]) == " ":
+                current += 1
+                continue
+            self.start = current
+            self.current = current + 1
+            if (rule := rules.get(c)) is not None:
+                rule(self)
+            else:
+                lox.error(self.line, "unexpected character")
+            current = self.current
+        self.tokens.append(Token(EOF, "", None, self.line))
+        self.types.append(EOF)
         return self.tokens
 
-    def scan_token(self) -> None:
-        c = self.advance()
-        match c:
-            case "(": self.add_token(TokenType.LEFT_PAREN)
-            case ")": self.add_token(TokenType.RIGHT_PAREN)
-            case "{": self.add_token(TokenType.LEFT_BRACE)
-            case "}": self.add_token(TokenType.RIGHT_BRACE)
-            case ",": self.add_token(TokenType.COMMA)
-            case ".": self.add_token(TokenType.DOT)
-            case "-": self.add_token(TokenType.MINUS)
-            case "+": self.add_token(TokenType.PLUS)
-            case ";": self.add_token(TokenType.SEMICOLON)
-            case "*": self.add_token(TokenType.STAR)
-            case "?": self.add_token(TokenType.QMARK)
-            case ":": self.add_token(TokenType.COLON)
-            case "!":
-                self.add_token(TokenType.BANG_EQUAL if self.match("=") else TokenType.BANG)
-            case "=":
-                self.add_token(TokenType.EQUAL_EQUAL if self.match("=") else TokenType.EQUAL)
-            case "<":
-                self.add_token(TokenType.LESSER_EQUAL if self.match("=") else TokenType.LESSER)
-            case ">":
-                self.add_token(
-                    TokenType.GREATER_EQUAL if self.match("=") else TokenType.GREATER
-                )
-            case "/":
-                if self.match("/"):
-                    # Skip single-line comments.
-                    while self.peek() != "\n" and not self.is_at_end():
-                        self.advance()
-                elif self.match("*"):
-                    # Skip multi-line comments.
-                    comment_start = self.line
-                    delimiters = 1
-                    while delimiters:
-                        curr = self.peek()
-                        next = self.peek_next()
-                        if next == "\0":
-                            lox.error(comment_start, "unterminated block comment")
-                            break
-                        elif curr == "/" and next == "*":
-                            delimiters += 1
-                        elif curr == "*" and next == "/":
-                            delimiters -= 1
-                        elif curr == "\n":
-                            self.line += 1
-                        self.advance()
-                    self.advance()
+    def slash(self) -> None:
+        source = self.source
+        end = len(source)
+        current = self.current
+        next = source[current] if current < end else "\0"
+        if next == "/":
+            # Skip single-line comments.
+            if (current := source.find("\n", current + 1)) == -1:
+                current = end
+            self.current = current
+        elif next == "*":
+            # Skip multi-line comments, which nest. Find each delimiter and
+            # count the lines before it in C rather than compare each pair
+            # of characters. Search again from the second character of a
+            # delimiter, as it may begin another one, like in `/*/`.
+            current += 1
+            line = self.line
+            delimiters = 1
+            while delimiters:
+                if (closing := source.find("*/", current)) == -1:
+                    lox.error(self.line, "unterminated block comment")
+                    last = max(current, end - 1)
+                    line += source.count("\n", current, last)
+                    current = last
+                    break
+                if (found := source.find("/*", current, closing + 1)) == -1:
+                    found = closing
+                    delimiters -= 1
                 else:
-                    self.add_token(TokenType.SLASH)
-            case " " | "\r" | "\t":
-                # Ignore whitespace.
-                pass
-            case "\n":
-                self.line += 1
-            case "\"":
-                self.string()
-            case _:
-                if self.is_digit(c):
-                    self.number()
-                elif self.is_alpha(c):
-                    self.identifier()
-                else:
-                    lox.error(self.line, "unexpected character")
+                    delimiters += 1
+                line += source.count("\n", current, found)
+                current = found + 1
+            self.current = current + 1
+            self.line = line
+        else:
+            self.add_token(SLASH)
+
+    def whitespace(self) -> None:
+        # Ignore whitespace.
+        pass
+
+    def newline(self) -> None:
+        self.line += 1
 
     def identifier(self) -> None:
-        while self.is_alphanumeric(self.peek()):
-            self.advance()
+        self.current = self.skip(ALPHANUMERIC, self.current)
 
-        if value := Scanner.keywords.get(self.source[self.start:self.current]):
-            self.add_token(value)
-        else:
-            self.add_token(TokenType.IDENTIFIER)
+        word = self.source[self.start:self.current]
+        if (entry := self.words.get(word)) is None:
+            # Intern names so each occurrence of a name shares one string.
+            # The dictionaries of scopes and environments keyed by names
+            # then compare keys by identity before they compare contents.
+            entry = self.words[word] = (IDENTIFIER, sys.intern(word))
+        token_type, lexeme = entry
+        self.tokens.append(Token(token_type, lexeme, None, self.line))
+        self.types.append(token_type)
 
     def number(self) -> None:
-        while self.is_digit(self.peek()):
-            self.advance()
-
-        if self.peek() == "." and self.is_digit(self.peek_next()):
-            self.advance()
-            while self.is_digit(self.peek()):
-                self.advance()
+        source = self.source
+        current = self.skip(DIGIT, self.current)
+        # A point is only part of the number if at least one digit follows.
+        if (
+            source.startswith(".", current) and
+            (fraction := self.skip(DIGIT, current + 1)) > current + 1
+        ):
+            current = fraction
+        self.current = current
 
-        self.add_token(TokenType.NUMBER, float(self.source[self.start:self.current]))
+        # Convert the lexeme itself rather than slice the source again.
+        lexeme = source[self.start:current]
+        self.tokens.append(Token(NUMBER, lexeme, float(lexeme), self.line))
+        self.types.append(NUMBER)
 
     def string(self) -> None:
-        while self.peek() != '"' and not self.is_at_end():
-            if self.peek() == "\n":
-                self.line += 1
-            self.advance()
-
-        if self.is_at_end():
+        # Find the closing quote and count the lines up to it in C rather
+        # than read the string one character at a time.
+        source = self.source
+        current = self.current
+        end = source.find('"', current)
+        if end == -1:
+            self.line += source.count("\n", current)
+            self.current = len(source)
             lox.error(self.line, "unterminated string")
             return
 
-        self.advance()
-        self.add_token(TokenType.STRING, self.source[self.start + 1:self.current - 1])
+        self.line += source.count("\n", current, end)
+        self.current = end + 1
+        # Share one string between occurrences of the same literal, so they
+        # compare equal by identity.
+        literal = source[current:end]
+        literal = self.strings.setdefault(literal, literal)
+        self.add_token(STRING, literal)
 
-    def match(self, expected: str) -> bool:
-        if self.is_at_end():
-            return False
-        elif self.source[self.current] != expected:
-            return False
+    def skip(self, mask: bytearray, current: int) -> int:
+        """Return index of first character from `current` not in `mask`."""
+        source = self.source
+        end = len(source)
+        while current < end and (code := ord(source[current])) < 128 and mask[code]:
+            current += 1
+        return current
 
-        self.current += 1
-        return True
+    def add_token(self, token_type: TokenType, literal: None | str | float = None) -> None:
+        self.tokens.append(
+            Token(token_type, self.source[self.start:self.current], literal, self.line)
+        )
+        self.types.append(token_type)
 
-    def peek(self) -> str:
-        if self.is_at_end():
-            return "\0"
-        return self.source[self.current]
 
-    def peek_next(self) -> str:
-        if self.current + 1 >= len(self.source):
-            return "\0"
-        return self.source[self.current + 1]
+def single(lexeme: str, token_type: TokenType) -> Callable[[Scanner], None]:
+    """Return a rule that adds a token of one character.
 
-    def is_alpha(self, c: str) -> bool:
-        assert len(c) == 1, "c must be a character."
-        return (c >= "a" and c <= "z") or (c >= "A" and c <= "Z") or (c == "_")
+    The lexeme of the token is always the same, so add the token with the
+    given lexeme rather than slice it from the source.
+    """
+    def rule(self: Scanner) -> None:
+        self.tokens.append(Token(token_type, lexeme, None, self.line))
+        self.types.append(token_type)
+    return rule
 
-    def is_alphanumeric(self, c: str) -> bool:
-        assert len(c) == 1, "c must be a character."
-        return self.is_alpha(c) or self.is_digit(c)
 
-    def is_digit(self, c: str) -> bool:
-        assert len(c) == 1, "c must be a character."
-        return (c >= "0") and (c <= "9")
+def either(
+    lexeme: str, token_type: TokenType, equal_type: TokenType
+) -> Callable[[Scanner], None]:
+    """Return a rule that adds a token of one character, or two with `=`."""
+    equal_lexeme = lexeme + "="
 
-    def is_at_end(self) -> bool:
-        return self.current >= len(self.source)
+    def rule(self: Scanner) -> None:
+        if self.source.startswith("=", self.current):
+            self.current += 1
+            self.tokens.append(Token(equal_type, equal_lexeme, None, self.line))
+            self.types.append(equal_type)
+        else:
+            self.tokens.append(Token(token_type, lexeme, None, self.line))
+            self.types.append(token_type)
+    return rule
 
-    def advance(self) -> str:
-        c = self.source[self.current]
-        self.current += 1
-        return c
 
-    def add_token(self, token_type: TokenType, literal: None | str | float = None) -> None:
-        self.tokens.append(
-            Token(token_type, self.source[self.start:self.current], literal, self.line)
-        )
+SCAN_RULES: dict[str, Callable[[Scanner], None]] = {
+    "(": single("(", TokenType.LEFT_PAREN),
+    ")": single(")", TokenType.RIGHT_PAREN),
+    "{": single("{", TokenType.LEFT_BRACE),
+    "}": single("}", TokenType.RIGHT_BRACE),
+    ",": single(",", TokenType.COMMA),
+    ".": single(".", TokenType.DOT),
+    "-": single("-", TokenType.MINUS),
+    "+": single("+", TokenType.PLUS),
+    ";": single(";", TokenType.SEMICOLON),
+    "*": single("*", TokenType.STAR),
+    "?": single("?", TokenType.QMARK),
+    ":": single(":", TokenType.COLON),
+    "!": either("!", TokenType.BANG, TokenType.BANG_EQUAL),
+    "=": either("=", TokenType.EQUAL, TokenType.EQUAL_EQUAL),
+    "<": either("<", TokenType.LESSER, TokenType.LESSER_EQUAL),
+    ">": either(">", TokenType.GREATER, TokenType.GREATER_EQUAL),
+    "/": Scanner.slash,
+    "\r": Scanner.whitespace,
+    "\t": Scanner.whitespace,
+    "\n": Scanner.newline,
+    "\"": Scanner.string,
+    **dict.fromkeys(digits, Scanner.number),
+    **dict.fromkeys(ascii_letters + "_", Scanner.identifier),
+}
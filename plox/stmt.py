@@ -62,6 +62,8 @@ class Stmt(ABC):
     the same types without changing the types themselves.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: Visitor[R]) -> R:
         raise NotImplementedError
@@ -76,6 +78,8 @@ class Block(Stmt):
         List of statements within the block
     """
 
+    __slots__ = ("statements",)
+
     def __init__(self, statements: list[Stmt]) -> None:
         self.statements = statements
 
@@ -96,6 +100,8 @@ class Class(Stmt):
         Functions accessible from instance of a class
     """
 
+    __slots__ = ("name", "superclass", "methods")
+
     def __init__(
         self, name: tokens.Token, superclass: expr.Variable, methods: list[Function]
     ) -> None:
@@ -115,6 +121,8 @@ class Expression(Stmt):
         Statement within expression
     """
 
+    __slots__ = ("expression",)
+
     def __init__(self, expression: expr.Expr) -> None:
         self.expression = expression
 
@@ -135,6 +143,8 @@ class Function(Stmt):
         Statements the function executes
     """
 
+    __slots__ = ("name", "params", "body")
+
     def __init__(
         self, name: tokens.Token, params: list[tokens.Token], body: list[Stmt]
     ) -> None:
@@ -159,6 +169,8 @@ class If(Stmt):
         Statement or block of statements to execute if false
     """
 
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__( self, condition: expr.Expr, then_branch: Stmt, else_branch: Stmt) -> None:
         self.condition = condition
         self.then_branch = then_branch
@@ -177,6 +189,8 @@ class Print(Stmt):
         Expression to write to stdout
     """
 
+    __slots__ = ("expression",)
+
     def __init__(self, expression: expr.Expr) -> None:
         self.expression = expression
 
@@ -195,6 +209,8 @@ class Return(Stmt):
         Value to return from function
     """
 
+    __slots__ = ("keyword", "value")
+
     def __init__(self, keyword: tokens.Token, value: expr.Expr) -> None:
         self.keyword = keyword
         self.value = value
@@ -212,6 +228,8 @@ class Break(Stmt):
         Token with `break` keyword
     """
 
+    __slots__ = ("keyword",)
+
     def __init__(self, keyword: tokens.Token) -> None:
         self.keyword = keyword
 
@@ -230,6 +248,8 @@ class While(Stmt):
         Statement or block of statements to execute each iteration
     """
 
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: expr.Expr, body: Stmt) -> None:
         self.condition = condition
         self.body = body
@@ -251,6 +271,8 @@ class Var(Stmt):
         Map of names to values that represent variables
     """
 
+    __slots__ = ("variables",)
+
     def __init__(self, variables: dict[tokens.Token, expr.Expr]) -> None:
         self.variables = variables
 
@@ -68,6 +68,9 @@ class Token:
         Line number of lexeme in source, used often in case of error
         reporting
     """
+
+    __slots__ = ("token_type", "lexeme", "literal", "line")
+
     def __init__(
         self,
         token_type: TokenType,